@@ -0,0 +1,35 @@
+from django.db import migrations
+
+# Columns searched with icontains by the employee list endpoint
+SEARCH_COLUMNS = ['username', 'first_name', 'last_name', 'email', 'employee_id']
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # PostgreSQL compiles icontains to UPPER("col"::text) LIKE UPPER(%s), so the
+    # trigram indexes are built on that exact expression and need no query changes
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for column in SEARCH_COLUMNS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS accounts_customuser_{column}_trgm '
+            f'ON accounts_customuser USING gin ((UPPER("{column}"::text)) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for column in SEARCH_COLUMNS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS accounts_customuser_{column}_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_customuser_unique_email'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
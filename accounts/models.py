@@ -33,6 +33,12 @@ class CustomUser(AbstractUser):
     emergency_contact_phone = models.CharField(max_length=50, null=True, blank=True)
     bio = models.TextField(null=True, blank=True)
     
+    class Meta(AbstractUser.Meta):
+        constraints = [
+            # Blank emails are allowed (e.g. createsuperuser), so only enforce on real addresses
+            models.UniqueConstraint(fields=['email'], condition=~models.Q(email=''), name='unique_user_email'),
+        ]
+    
     def __str__(self):
         return f"{self.username} ({self.get_role_display()})"
     
@@ -274,16 +274,20 @@ class MoodAnalysisService:
             created_at__date__lte=analysis_date
         )
         
-        # Recent performance indicators (simplified)
-        recent_overtime = attendance_records.filter(overtime_hours__gt=0).count()
-        recent_late_arrivals = attendance_records.filter(is_late=True).count()
-        total_records = attendance_records.count()
+        # Recent performance indicators (simplified), counted in one pass
+        counts = attendance_records.aggregate(
+            total=Count('id'),
+            overtime=Count('id', filter=Q(overtime_hours__gt=0)),
+            late=Count('id', filter=Q(is_late=True)),
+            absent=Count('id', filter=Q(status='ABSENT'))
+        )
+        total_records = counts['total']
         
         data_sources = {
-            'attendance_consistency': 1.0 - (recent_late_arrivals / max(total_records, 1)),
-            'overtime_frequency': recent_overtime / max(total_records, 1),
+            'attendance_consistency': 1.0 - (counts['late'] / max(total_records, 1)),
+            'overtime_frequency': counts['overtime'] / max(total_records, 1),
             'leave_frequency': leave_applications.count(),
-            'recent_absences': attendance_records.filter(status='ABSENT').count(),
+            'recent_absences': counts['absent'],
             'total_attendance_records': total_records
         }
         
@@ -487,9 +491,14 @@ class LeaveRecommendationService:
         leave_balances = LeaveBalance.objects.filter(employee=employee)
         
         # Calculate metrics
-        total_records = attendance_records.count()
-        overtime_records = attendance_records.filter(overtime_hours__gt=0).count()
-        late_records = attendance_records.filter(is_late=True).count()
+        counts = attendance_records.aggregate(
+            total=Count('id'),
+            overtime=Count('id', filter=Q(overtime_hours__gt=0)),
+            late=Count('id', filter=Q(is_late=True))
+        )
+        total_records = counts['total']
+        overtime_records = counts['overtime']
+        late_records = counts['late']
         
         # Calculate scores
         workload_score = min(1.0, (overtime_records / max(total_records, 1)) * 2)
@@ -6,7 +6,7 @@ from datetime import date, timedelta
 
 from .models import (
     WorkSchedule, EmployeeSchedule, AttendanceRecord, 
-    BreakRecord, AttendancePolicy, Holiday
+    BreakRecord, AttendancePolicy, Holiday, AttendanceMonthlyRollup
 )
 
 @admin.register(WorkSchedule)
@@ -220,6 +220,23 @@ class HolidayAdmin(admin.ModelAdmin):
         })
     )
 
+@admin.register(AttendanceMonthlyRollup)
+class AttendanceMonthlyRollupAdmin(admin.ModelAdmin):
+    list_display = [
+        'employee', 'month', 'present_days', 'absent_days', 'late_days',
+        'total_hours', 'overtime_hours', 'refreshed_at'
+    ]
+    list_filter = ['month']
+    search_fields = ['employee__username', 'employee__first_name', 'employee__last_name']
+    date_hierarchy = 'month'
+    readonly_fields = [
+        'employee', 'month', 'total_records', 'present_days', 'absent_days',
+        'half_days', 'late_days', 'total_hours', 'overtime_hours', 'refreshed_at'
+    ]
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('employee')
+
 # Custom admin actions
 def mark_present(modeladmin, request, queryset):
     """Mark selected attendance records as present"""
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from datetime import date, timedelta
+from attendance.models import AttendanceMonthlyRollup
+
+
+class Command(BaseCommand):
+    help = 'Rebuild monthly attendance rollups for recently completed months (run nightly)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months',
+            type=int,
+            default=12,
+            help='Number of completed months to rebuild, counting back from last month'
+        )
+
+    def handle(self, *args, **options):
+        months = max(options['months'], 1)
+
+        # Only completed months are rolled up; the current month is always read live
+        end_month = date.today().replace(day=1)
+        start_year, start_month_index = divmod(end_month.year * 12 + end_month.month - 1 - months, 12)
+        start_month = date(start_year, start_month_index + 1, 1)
+
+        count = AttendanceMonthlyRollup.refresh(start_month, end_month)
+        last_month = (end_month - timedelta(days=1)).replace(day=1)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'✓ Rebuilt {count} attendance rollups for {start_month:%B %Y} through {last_month:%B %Y}'
+            )
+        )
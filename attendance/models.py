@@ -1,4 +1,6 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Q, Count, Sum
+from django.db.models.functions import TruncMonth
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
@@ -140,6 +142,10 @@ class AttendanceRecord(models.Model):
     class Meta:
         unique_together = ['employee', 'date']
         ordering = ['-date', 'employee']
+        indexes = [
+            models.Index(fields=['date', 'status']),
+            models.Index(fields=['date', 'is_late']),
+        ]
     
     def __str__(self):
         return f"{self.employee.username} - {self.date} ({self.get_status_display()})"
@@ -193,6 +199,63 @@ class AttendanceRecord(models.Model):
         
         super().save(*args, **kwargs)
 
+def attendance_totals():
+    """Aggregate expressions shared by attendance reports and monthly rollups"""
+    return {
+        'total_records': Count('id'),
+        'present_days': Count('id', filter=Q(status='PRESENT')),
+        'absent_days': Count('id', filter=Q(status='ABSENT')),
+        'half_days': Count('id', filter=Q(status='HALF_DAY')),
+        'late_days': Count('id', filter=Q(is_late=True)),
+        'total_hours': Sum('actual_hours'),
+        'overtime_hours': Sum('overtime_hours'),
+    }
+
+class AttendanceMonthlyRollup(models.Model):
+    """Per-employee monthly attendance totals, rebuilt nightly from AttendanceRecord"""
+    employee = models.ForeignKey(User, on_delete=models.CASCADE, related_name='attendance_rollups')
+    month = models.DateField(help_text='First day of the month')
+    
+    total_records = models.PositiveIntegerField(default=0)
+    present_days = models.PositiveIntegerField(default=0)
+    absent_days = models.PositiveIntegerField(default=0)
+    half_days = models.PositiveIntegerField(default=0)
+    late_days = models.PositiveIntegerField(default=0)
+    total_hours = models.DecimalField(max_digits=8, decimal_places=2, default=0)
+    overtime_hours = models.DecimalField(max_digits=8, decimal_places=2, default=0)
+    
+    refreshed_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ['employee', 'month']
+        ordering = ['-month', 'employee']
+        indexes = [
+            models.Index(fields=['month']),
+        ]
+    
+    def __str__(self):
+        return f"{self.employee.username} - {self.month:%B %Y}"
+    
+    @classmethod
+    def refresh(cls, start_month, end_month):
+        """Rebuild the rollups for every month in [start_month, end_month)"""
+        rows = AttendanceRecord.objects.filter(
+            date__gte=start_month, date__lt=end_month
+        ).annotate(
+            month=TruncMonth('date')
+        ).values('employee_id', 'month').annotate(**attendance_totals()).order_by()
+        
+        rollups = [
+            cls(**{key: value or 0 for key, value in row.items()})
+            for row in rows
+        ]
+        
+        with transaction.atomic():
+            cls.objects.filter(month__gte=start_month, month__lt=end_month).delete()
+            cls.objects.bulk_create(rollups, batch_size=500)
+        
+        return len(rollups)
+
 class BreakRecord(models.Model):
     """Break session records"""
     BREAK_TYPE_CHOICES = [
@@ -242,18 +305,16 @@ class BreakRecord(models.Model):
     def update_attendance_record(self):
         """Update parent attendance record with break totals"""
         attendance = self.attendance_record
-        total_breaks = BreakRecord.objects.filter(
+        totals = BreakRecord.objects.filter(
             attendance_record=attendance,
             end_time__isnull=False
+        ).aggregate(
+            sessions=Count('id'),
+            duration=Sum('duration')
         )
         
-        total_duration = sum(
-            (break_record.duration for break_record in total_breaks),
-            timedelta(0)
-        )
-        
-        attendance.total_break_duration = total_duration
-        attendance.break_sessions_count = total_breaks.count()
+        attendance.total_break_duration = totals['duration'] or timedelta(0)
+        attendance.break_sessions_count = totals['sessions']
         attendance.save()
 
 class AttendancePolicy(models.Model):
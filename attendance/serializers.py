@@ -31,6 +31,9 @@ class WorkScheduleSerializer(serializers.ModelSerializer):
 class EmployeeScheduleSerializer(serializers.ModelSerializer):
     """Serializer for employee schedules"""
     employee = UserSerializer(read_only=True)
+    employee_id = serializers.PrimaryKeyRelatedField(
+        queryset=User.objects.all(), source='employee', write_only=True
+    )
     schedule = WorkScheduleSerializer(read_only=True)
     schedule_id = serializers.IntegerField(write_only=True)
     effective_start_time = serializers.ReadOnlyField()
@@ -39,7 +42,7 @@ class EmployeeScheduleSerializer(serializers.ModelSerializer):
     class Meta:
         model = EmployeeSchedule
         fields = [
-            'id', 'employee', 'schedule', 'schedule_id', 'start_date', 'end_date',
+            'id', 'employee', 'employee_id', 'schedule', 'schedule_id', 'start_date', 'end_date',
             'custom_start_time', 'custom_end_time', 'effective_start_time',
             'effective_end_time', 'is_active', 'created_at'
         ]
@@ -324,12 +327,12 @@ class BreakStartSerializer(serializers.Serializer):
             raise serializers.ValidationError('Must be checked in to start a break.')
         
         # Check for ongoing break
-        ongoing_break = BreakRecord.objects.filter(
+        has_ongoing_break = BreakRecord.objects.filter(
             attendance_record=attendance,
             end_time__isnull=True
-        ).first()
+        ).exists()
         
-        if ongoing_break:
+        if has_ongoing_break:
             raise serializers.ValidationError('Already on a break. End current break first.')
         
         break_record = BreakRecord.objects.create(
@@ -22,6 +22,9 @@ urlpatterns = [
     # Dashboard
     path('dashboard/', views.attendance_dashboard, name='attendance-dashboard'),
     
+    # Reports
+    path('reports/generate/', views.generate_attendance_report, name='attendance-report-generate'),
+    
     # Holidays
     path('holidays/', views.HolidayListCreateAPIView.as_view(), name='holiday-list-create'),
     path('holidays/<int:pk>/', views.HolidayDetailAPIView.as_view(), name='holiday-detail'),
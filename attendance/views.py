@@ -2,23 +2,32 @@ from rest_framework import generics, status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework.pagination import PageNumberPagination
 from django.db.models import Q, Count, Avg, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
 from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.views.decorators.http import condition
 from django.utils import timezone
 from datetime import datetime, date, timedelta
+import csv
+import json
 
 from .models import (
     WorkSchedule, EmployeeSchedule, AttendanceRecord, 
-    BreakRecord, AttendancePolicy, Holiday
+    BreakRecord, AttendancePolicy, Holiday,
+    AttendanceMonthlyRollup, attendance_totals
 )
 from .serializers import (
     WorkScheduleSerializer, EmployeeScheduleSerializer,
     AttendanceRecordDetailSerializer, AttendanceRecordListSerializer,
     CheckInSerializer, CheckOutSerializer, BreakRecordSerializer,
-    AttendancePolicySerializer, HolidaySerializer
+    AttendancePolicySerializer, HolidaySerializer, AttendanceReportSerializer
 )
 from accounts.views import IsHRPermission
+from leave.models import LeaveApplication
 
 User = get_user_model()
 
@@ -65,6 +74,10 @@ class AttendanceRecordListAPIView(generics.ListAPIView):
     serializer_class = AttendanceRecordListSerializer
     
     def get_queryset(self):
+        # Built once per request; the view instance does not outlive it
+        if hasattr(self, '_queryset_cache'):
+            return self._queryset_cache
+        
         user = self.request.user
         queryset = AttendanceRecord.objects.select_related('employee').all()
         
@@ -87,7 +100,8 @@ class AttendanceRecordListAPIView(generics.ListAPIView):
         if status_filter:
             queryset = queryset.filter(status=status_filter)
         
-        return queryset.order_by('-date', '-check_in_time')
+        self._queryset_cache = queryset.order_by('-date', '-check_in_time')
+        return self._queryset_cache
 
 
 class AttendanceRecordDetailAPIView(generics.RetrieveAPIView):
@@ -133,16 +147,23 @@ class CheckOutAPIView(APIView):
 
 
 # Current Status View
+def _current_status_etag(request):
+    """ETag for today's status: changes whenever today's record (or a break on it) is saved"""
+    today = date.today()
+    updated_at = request.user.attendance_records.filter(date=today).values_list('updated_at', flat=True).first()
+    return f"{request.user.id}:{today}:{updated_at.timestamp() if updated_at else 'none'}"
+
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@condition(etag_func=_current_status_etag)
 def current_attendance_status(request):
     """Get current user's attendance status for today"""
     today = date.today()
     try:
-        record = AttendanceRecord.objects.select_related('employee').prefetch_related('break_records').get(
-            employee=request.user,
-            date=today
-        )
+        # Going through the reverse manager reuses request.user as the record's
+        # employee, so the user row is neither joined nor re-fetched
+        record = request.user.attendance_records.prefetch_related('break_records').get(date=today)
         serializer = AttendanceRecordDetailSerializer(record)
         return Response(serializer.data)
     except AttendanceRecord.DoesNotExist:
@@ -158,34 +179,176 @@ def current_attendance_status(request):
 def attendance_dashboard(request):
     """Get attendance dashboard statistics"""
     today = date.today()
-    
-    # Today's statistics
-    today_records = AttendanceRecord.objects.filter(date=today)
-    total_employees = User.objects.filter(role='EMPLOYEE', is_active=True).count()
-    present_count = today_records.filter(status='PRESENT').count()
-    absent_count = today_records.filter(status='ABSENT').count()
-    late_count = today_records.filter(is_late=True).count()
-    
-    # This month's statistics
     month_start = today.replace(day=1)
-    month_records = AttendanceRecord.objects.filter(date__gte=month_start, date__lte=today)
-    avg_attendance = month_records.filter(status='PRESENT').count()
+    total_employees = User.objects.filter(role='EMPLOYEE', is_active=True).count()
+
+    # Today's and this month's counts in a single pass over the month's records
+    stats = AttendanceRecord.objects.filter(
+        date__gte=month_start, date__lte=today
+    ).aggregate(
+        present=Count('id', filter=Q(date=today, status='PRESENT')),
+        absent=Count('id', filter=Q(date=today, status='ABSENT')),
+        late=Count('id', filter=Q(date=today, is_late=True)),
+        month_present=Count('id', filter=Q(status='PRESENT')),
+    )
     
+    # An employee can hold overlapping approved applications; count each once
+    on_leave = LeaveApplication.objects.filter(
+        status='APPROVED', start_date__lte=today, end_date__gte=today,
+        employee__role='EMPLOYEE', employee__is_active=True
+    ).aggregate(employees=Count('employee', distinct=True))['employees']
+
     return Response({
         'today': {
             'total_employees': total_employees,
-            'present': present_count,
-            'absent': absent_count,
-            'late': late_count,
-            'on_leave': 0,  # This would need integration with leave module
+            'present': stats['present'],
+            'absent': stats['absent'],
+            'late': stats['late'],
+            'on_leave': on_leave,
         },
         'this_month': {
             'total_working_days': (today - month_start).days + 1,
-            'average_attendance': avg_attendance,
+            'average_attendance': stats['month_present'],
         }
     })
 
 
+# Report Views
+REPORT_EXPORT_FIELDS = [
+    'date', 'employee__username', 'status', 'check_in_time', 'check_out_time',
+    'is_late', 'actual_hours', 'overtime_hours',
+]
+REPORT_PAGE_SIZE = 100
+
+
+class _Echo:
+    """File-like object that hands each written CSV row straight back"""
+    def write(self, value):
+        return value
+
+
+def _stream_report_csv(queryset):
+    """Yield CSV lines for a report queryset without materializing it"""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(field.split('__')[0] for field in REPORT_EXPORT_FIELDS)
+    for row in queryset.values_list(*REPORT_EXPORT_FIELDS).iterator(chunk_size=2000):
+        yield writer.writerow(row)
+
+
+def _stream_report_ndjson(queryset):
+    """Yield one JSON document per report row without materializing the queryset"""
+    keys = [field.split('__')[0] for field in REPORT_EXPORT_FIELDS]
+    for row in queryset.values_list(*REPORT_EXPORT_FIELDS).iterator(chunk_size=2000):
+        yield json.dumps(dict(zip(keys, row)), cls=DjangoJSONEncoder) + '\n'
+
+
+@api_view(['GET'])
+@permission_classes([IsHRPermission])
+def generate_attendance_report(request):
+    """Generate a daily, weekly, monthly or summary attendance report (HR only)
+    
+    DAILY records are paginated (``page``); pass ``export=csv`` or
+    ``export=ndjson`` to stream every row instead.
+    """
+    serializer = AttendanceReportSerializer(data=request.query_params)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    params = serializer.validated_data
+    start_date = params['start_date']
+    end_date = params['end_date']
+    report_type = params['report_type']
+    
+    queryset = AttendanceRecord.objects.filter(date__gte=start_date, date__lte=end_date)
+    if params.get('employee_id'):
+        queryset = queryset.filter(employee_id=params['employee_id'])
+    
+    report = {
+        'report_type': report_type,
+        'period': {
+            'start_date': start_date,
+            'end_date': end_date,
+        },
+    }
+    
+    if report_type == 'DAILY':
+        queryset = queryset.select_related('employee').order_by('date', 'employee__username')
+        export = request.query_params.get('export')
+        if export == 'csv':
+            response = StreamingHttpResponse(_stream_report_csv(queryset), content_type='text/csv')
+            response['Content-Disposition'] = (
+                f'attachment; filename="attendance_{start_date}_{end_date}.csv"'
+            )
+            return response
+        if export == 'ndjson':
+            return StreamingHttpResponse(_stream_report_ndjson(queryset), content_type='application/x-ndjson')
+        paginator = PageNumberPagination()
+        paginator.page_size = REPORT_PAGE_SIZE
+        page = paginator.paginate_queryset(queryset, request)
+        report['total_records'] = paginator.page.paginator.count
+        report['next'] = paginator.get_next_link()
+        report['previous'] = paginator.get_previous_link()
+        report['records'] = AttendanceRecordListSerializer(page, many=True).data
+        return Response(report)
+    
+    if report_type == 'SUMMARY':
+        # Completed months come pre-aggregated from the rollup table
+        periods = _monthly_report_periods(queryset, start_date, end_date, params.get('employee_id'))
+        report['summary'] = {
+            key: sum(period[key] or 0 for period in periods)
+            for key in attendance_totals()
+        }
+        return Response(report)
+    
+    if report_type == 'WEEKLY':
+        report['periods'] = list(
+            queryset.annotate(period_start=TruncWeek('date'))
+            .values('period_start')
+            .annotate(**attendance_totals())
+            .order_by('period_start')
+        )
+        return Response(report)
+    
+    report['periods'] = _monthly_report_periods(queryset, start_date, end_date, params.get('employee_id'))
+    return Response(report)
+
+
+def _monthly_report_periods(queryset, start_date, end_date, employee_id=None):
+    """Monthly report rows, reading completed months from AttendanceMonthlyRollup
+    
+    Only months that lie entirely inside the range, precede the current
+    month and have been rolled up come from the rollup table; everything
+    else is aggregated live.
+    """
+    rollup_start = start_date if start_date.day == 1 else (start_date.replace(day=1) + timedelta(days=32)).replace(day=1)
+    rollup_end = min((end_date + timedelta(days=1)).replace(day=1), date.today().replace(day=1))
+    
+    periods = {}
+    if rollup_start < rollup_end:
+        rollups = AttendanceMonthlyRollup.objects.filter(month__gte=rollup_start, month__lt=rollup_end)
+        if employee_id:
+            rollups = rollups.filter(employee_id=employee_id)
+        rollup_rows = rollups.values('month').annotate(
+            total_records=Sum('total_records'),
+            present_days=Sum('present_days'),
+            absent_days=Sum('absent_days'),
+            half_days=Sum('half_days'),
+            late_days=Sum('late_days'),
+            total_hours=Sum('total_hours'),
+            overtime_hours=Sum('overtime_hours'),
+        ).order_by()
+        for row in rollup_rows:
+            periods[row.pop('month')] = row
+    
+    live_rows = queryset.annotate(period_start=TruncMonth('date')).exclude(
+        period_start__in=list(periods)
+    ).values('period_start').annotate(**attendance_totals()).order_by()
+    for row in live_rows:
+        periods[row.pop('period_start')] = row
+    
+    return [{'period_start': month, **periods[month]} for month in sorted(periods)]
+
+
 # Holiday Views
 class HolidayListCreateAPIView(generics.ListCreateAPIView):
     """List all holidays or create a new one (HR only)"""
@@ -8,53 +8,54 @@ from messaging.models import Message
 from accounts.models import CustomUser
 
 print("\n=== Database Check ===")
-print(f"Total users: {CustomUser.objects.count()}")
-print(f"Total messages: {Message.objects.count()}")
+user_count = CustomUser.objects.count()
+message_count = Message.objects.count()
+print(f"Total users: {user_count}")
+print(f"Total messages: {message_count}")
 
 print("\n=== All Users ===")
 for user in CustomUser.objects.all():
     print(f"  - {user.username} ({user.email}) - Role: {user.role}")
 
 print("\n=== All Messages ===")
-if Message.objects.count() == 0:
+if message_count == 0:
     print("  No messages found!")
     
     # Create test messages if there are at least 2 users
-    if CustomUser.objects.count() >= 2:
+    if user_count >= 2:
         users = list(CustomUser.objects.all()[:2])
         user1, user2 = users[0], users[1]
         
         print(f"\n=== Creating Test Messages ===")
-        # Message 1: user1 -> user2
-        msg1 = Message.objects.create(
-            sender=user1,
-            recipient=user2,
-            subject="Test Message 1",
-            body="This is a test message from {} to {}".format(user1.username, user2.username)
-        )
-        print(f"  Created: {msg1}")
-        
-        # Message 2: user2 -> user1
-        msg2 = Message.objects.create(
-            sender=user2,
-            recipient=user1,
-            subject="Test Message 2",
-            body="This is a test message from {} to {}".format(user2.username, user1.username)
-        )
-        print(f"  Created: {msg2}")
-        
-        # Message 3: user1 -> user2
-        msg3 = Message.objects.create(
-            sender=user1,
-            recipient=user2,
-            subject="Follow-up Message",
-            body="This is a follow-up message"
-        )
-        print(f"  Created: {msg3}")
+        messages = Message.objects.bulk_create([
+            # Message 1: user1 -> user2
+            Message(
+                sender=user1,
+                recipient=user2,
+                subject="Test Message 1",
+                body="This is a test message from {} to {}".format(user1.username, user2.username)
+            ),
+            # Message 2: user2 -> user1
+            Message(
+                sender=user2,
+                recipient=user1,
+                subject="Test Message 2",
+                body="This is a test message from {} to {}".format(user2.username, user1.username)
+            ),
+            # Message 3: user1 -> user2
+            Message(
+                sender=user1,
+                recipient=user2,
+                subject="Follow-up Message",
+                body="This is a follow-up message"
+            ),
+        ])
+        for msg in messages:
+            print(f"  Created: {msg}")
         
         print(f"\n✅ Created 3 test messages!")
 else:
-    for msg in Message.objects.all():
+    for msg in Message.objects.select_related('sender', 'recipient'):
         print(f"  - Message #{msg.id}: {msg.sender.username} -> {msg.recipient.username}")
         print(f"    Subject: {msg.subject}")
         print(f"    Read: {msg.is_read}")
@@ -0,0 +1,63 @@
+"""
+Static index of the API endpoints served by api_root.
+"""
+import hashlib
+import json
+
+API_ROOT_PAYLOAD = {
+    'message': 'Employee Management System API',
+    'version': '1.0',
+    'status': 'active',
+    'endpoints': {
+        'authentication': {
+            'login': '/api/login/',
+            'logout': '/api/logout/',
+            'refresh': '/api/refresh/',
+            'profile': '/api/profile/',
+            'dashboard': '/api/dashboard/',
+        },
+        'employee_management': {
+            'employees': '/api/employee-management/',
+            'positions': '/api/employee-management/positions/',
+            'statistics': '/api/employee-management/statistics/',
+        },
+        'leave_management': {
+            'applications': '/api/leave-management/applications/',
+            'types': '/api/leave-management/types/',
+            'my_balances': '/api/leave-management/my-balances/',
+        },
+        'attendance_management': {
+            'check_in': '/api/attendance-management/check-in/',
+            'check_out': '/api/attendance-management/check-out/',
+            'records': '/api/attendance-management/records/',
+            'statistics': '/api/attendance-management/statistics/',
+        },
+        'messaging': {
+            'messages': '/api/messaging/messages/',
+            'announcements': '/api/messaging/announcements/',
+            'inbox': '/api/messaging/messages/inbox/',
+            'sent': '/api/messaging/messages/sent/',
+        },
+        'ai_services': {
+            'overview': '/api/ai-services/overview/',
+            'attendance_prediction': '/api/ai-services/attendance/',
+            'mood_analysis': '/api/ai-services/mood/',
+            'leave_recommendations': '/api/ai-services/leave/',
+            'comprehensive_analysis': '/api/ai-services/analysis/comprehensive/',
+            'daily_analysis': '/api/ai-services/analysis/daily-all/',
+        },
+        'hr_management': {
+            'recruitment_questions': '/api/hr-management/recruitment/questions/',
+            'recruitment_candidates': '/api/hr-management/recruitment/candidates/',
+            'training_programs': '/api/hr-management/training/programs/',
+            'training_enrollments': '/api/hr-management/training/enrollments/',
+            'performance_reviews': '/api/hr-management/performance/reviews/',
+            'employee_performance_report': '/api/hr-management/performance/reports/employee/?employee_id=<id>',
+            'feedback_360': '/api/hr-management/performance/feedback-360/',
+        },
+        'admin': '/admin/'
+    }
+}
+
+# The payload is fixed at import time, so its ETag is too
+API_ROOT_ETAG = hashlib.md5(json.dumps(API_ROOT_PAYLOAD, sort_keys=True).encode()).hexdigest()
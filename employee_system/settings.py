@@ -101,6 +101,9 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Reuse connections across requests instead of reconnecting every time
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=60, cast=int),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -113,6 +116,8 @@ DATABASES = {
 #         'PASSWORD': config('DB_PASSWORD', default=''),
 #         'HOST': config('DB_HOST', default='localhost'),
 #         'PORT': config('DB_PORT', default='5432'),
+#         'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=60, cast=int),
+#         'CONN_HEALTH_CHECKS': True,
 #     }
 # }
 
@@ -157,6 +162,17 @@ STATIC_URL = 'static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Point the default storage at a cloud backend in production so uploaded files
+# are served from their own URLs instead of through Django
+STORAGES = {
+    'default': {
+        'BACKEND': config('DEFAULT_FILE_STORAGE_BACKEND', default='django.core.files.storage.FileSystemStorage'),
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -18,6 +18,9 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+from django.views.generic import RedirectView
 from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
@@ -27,82 +30,34 @@ from drf_spectacular.views import (
     SpectacularRedocView
 )
 
+from .api_index import API_ROOT_ETAG, API_ROOT_PAYLOAD
+
+@cache_control(public=True, max_age=3600)
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@condition(etag_func=lambda request: API_ROOT_ETAG)
 def api_root(request):
     """API root endpoint with available endpoints"""
-    return Response({
-        'message': 'Employee Management System API',
-        'version': '1.0',
-        'status': 'active',
-        'endpoints': {
-            'authentication': {
-                'login': '/api/login/',
-                'logout': '/api/logout/',
-                'refresh': '/api/refresh/',
-                'profile': '/api/profile/',
-                'dashboard': '/api/dashboard/',
-            },
-            'employee_management': {
-                'employees': '/api/employee-management/',
-                'positions': '/api/employee-management/positions/',
-                'statistics': '/api/employee-management/statistics/',
-            },
-            'leave_management': {
-                'applications': '/api/leave-management/applications/',
-                'types': '/api/leave-management/types/',
-                'my_balances': '/api/leave-management/my-balances/',
-            },
-            'attendance_management': {
-                'check_in': '/api/attendance-management/check-in/',
-                'check_out': '/api/attendance-management/check-out/',
-                'records': '/api/attendance-management/records/',
-                'statistics': '/api/attendance-management/statistics/',
-            },
-            'messaging': {
-                'messages': '/api/messaging/messages/',
-                'announcements': '/api/messaging/announcements/',
-                'inbox': '/api/messaging/messages/inbox/',
-                'sent': '/api/messaging/messages/sent/',
-            },
-            'ai_services': {
-                'overview': '/api/ai-services/overview/',
-                'attendance_prediction': '/api/ai-services/attendance/',
-                'mood_analysis': '/api/ai-services/mood/',
-                'leave_recommendations': '/api/ai-services/leave/',
-                'comprehensive_analysis': '/api/ai-services/analysis/comprehensive/',
-                'daily_analysis': '/api/ai-services/analysis/daily-all/',
-            },
-            'hr_management': {
-                'recruitment_questions': '/api/hr-management/recruitment/questions/',
-                'recruitment_candidates': '/api/hr-management/recruitment/candidates/',
-                'training_programs': '/api/hr-management/training/programs/',
-                'training_enrollments': '/api/hr-management/training/enrollments/',
-                'performance_reviews': '/api/hr-management/performance/reviews/',
-                'employee_performance_report': '/api/hr-management/performance/reports/employee/?employee_id=<id>',
-                'feedback_360': '/api/hr-management/performance/feedback-360/',
-            },
-            'admin': '/admin/'
-        }
-    })
+    return Response(API_ROOT_PAYLOAD)
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
-    path('', api_root, name='root'),
-    path('api/', api_root, name='api_root'),  # API root at /api/
-    path('api/docs/', api_root, name='api_docs'),
-    # API Schema and Documentation URLs
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
-    path('api/schema/swagger/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
-    path('api/schema/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
-    # API Endpoints
-    path('api/', include('accounts.urls')),
+    # API Endpoints; the app prefixes come before the bare 'api/' accounts
+    # include so most requests resolve without walking its patterns first
     path('api/employee-management/', include('employees.urls')),
     path('api/leave-management/', include('leave.urls')),
     path('api/attendance-management/', include('attendance.urls')),
     path('api/messaging/', include('messaging.urls')),
     path('api/ai-services/', include('ai_services.urls')),
     path('api/hr-management/', include('hr_management.urls')),
+    path('api/', include('accounts.urls')),
+    path('api/', api_root, name='api_root'),  # API root at /api/
+    path('api/docs/', RedirectView.as_view(pattern_name='api_root', permanent=True), name='api_docs'),
+    # API Schema and Documentation URLs
+    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
+    path('api/schema/swagger/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
+    path('api/schema/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
+    path('admin/', admin.site.urls),
+    path('', api_root, name='root'),
 ]
 
 # Serve media files during development
@@ -12,11 +12,13 @@ class EmployeeDocumentInline(admin.TabularInline):
     model = EmployeeDocument
     extra = 0
     readonly_fields = ('uploaded_at',)
+    raw_id_fields = ('uploaded_by',)
 
 class EmployeeNoteInline(admin.TabularInline):
     model = EmployeeNote
     extra = 0
     readonly_fields = ('created_at',)
+    raw_id_fields = ('author',)
 
 @admin.register(EmployeeProfile)
 class EmployeeProfileAdmin(admin.ModelAdmin):
@@ -24,6 +26,8 @@ class EmployeeProfileAdmin(admin.ModelAdmin):
         'full_name', 'position', 'employment_type', 'status', 
         'supervisor', 'created_at'
     )
+    list_select_related = ('user', 'position', 'supervisor')
+    autocomplete_fields = ('user', 'position', 'supervisor')
     list_filter = (
         'employment_type', 'status', 'position', 'gender', 
         'user__department', 'created_at'
@@ -62,6 +66,8 @@ class EmployeeDocumentAdmin(admin.ModelAdmin):
     list_display = (
         'employee', 'document_type', 'title', 'uploaded_by', 'uploaded_at'
     )
+    list_select_related = ('employee__user', 'employee__position', 'uploaded_by')
+    autocomplete_fields = ('employee', 'uploaded_by')
     list_filter = ('document_type', 'uploaded_at')
     search_fields = ('employee__user__first_name', 'employee__user__last_name', 'title')
     ordering = ('-uploaded_at',)
@@ -71,6 +77,8 @@ class EmployeeNoteAdmin(admin.ModelAdmin):
     list_display = (
         'employee', 'note_type', 'author', 'is_confidential', 'created_at'
     )
+    list_select_related = ('employee__user', 'employee__position', 'author')
+    autocomplete_fields = ('employee', 'author')
     list_filter = ('note_type', 'is_confidential', 'created_at')
     search_fields = ('employee__user__first_name', 'employee__user__last_name', 'note')
     ordering = ('-created_at',)
\ No newline at end of file
@@ -1,7 +1,29 @@
+import logging
+import threading
+
 from django.core.mail import send_mail
 from django.conf import settings
+from django.db import connections, transaction
 from django.template.loader import render_to_string
 
+logger = logging.getLogger(__name__)
+
+# Resolved once; the login link in every welcome email is built from it
+FRONTEND_URL = getattr(settings, 'FRONTEND_URL', 'http://localhost:5173')
+
+TEMPORARY_PASSWORD_SUBJECT = 'Welcome to Employee Management System - Your Account Details'
+
+
+def _render_temporary_password_message(employee_name, username, temporary_password, login_url=None):
+    if not login_url:
+        login_url = f"{FRONTEND_URL}/login"
+    return render_to_string('employees/temporary_password.txt', {
+        'employee_name': employee_name,
+        'username': username,
+        'temporary_password': temporary_password,
+        'login_url': login_url,
+    })
+
 
 def send_temporary_password_email(employee_email, employee_name, username, temporary_password, login_url=None):
     """
@@ -17,52 +39,49 @@ def send_temporary_password_email(employee_email, employee_name, username, tempo
     Returns:
         True if email sent successfully, False otherwise
     """
-    # Get login URL from settings or use default
-    if not login_url:
-        frontend_url = settings.FRONTEND_URL if hasattr(settings, 'FRONTEND_URL') else 'http://localhost:5173'
-        login_url = f"{frontend_url}/login"
-    
-    subject = 'Welcome to Employee Management System - Your Account Details'
-    
-    message = f"""
-Dear {employee_name},
-
-Welcome to the Employee Management System!
-
-Your account has been created successfully. Below are your login credentials:
-
-Username: {username}
-Temporary Password: {temporary_password}
-
-For security reasons, you will be required to change your password after your first login.
-
-🔗 ACCESS YOUR ACCOUNT:
-Click here to login: {login_url}
-
-Or copy and paste this link in your browser:
-{login_url}
-
-Login Instructions:
-1. Click the link above or go to the login page
-2. Enter your username and temporary password
-3. You will be automatically redirected to change your password
-4. After changing your password, you can access your dashboard
-
-If you have any questions or need assistance, please contact the HR department.
-
-Best regards,
-HR Department
-    """
+    message = _render_temporary_password_message(employee_name, username, temporary_password, login_url)
     
     try:
         send_mail(
-            subject=subject,
+            subject=TEMPORARY_PASSWORD_SUBJECT,
             message=message,
             from_email=settings.DEFAULT_FROM_EMAIL,
             recipient_list=[employee_email],
             fail_silently=False,
         )
         return True
-    except Exception as e:
-        print(f"Error sending email to {employee_email}: {str(e)}")
+    except Exception:
+        logger.exception("Error sending temporary password email to %s", employee_email)
         return False
+
+
+def _send_temporary_password_email_to_user(user_id, temporary_password, login_url=None):
+    from django.contrib.auth import get_user_model
+    
+    try:
+        user = get_user_model().objects.only('email', 'first_name', 'last_name', 'username').get(pk=user_id)
+        send_temporary_password_email(
+            employee_email=user.email,
+            employee_name=user.get_full_name() or user.username,
+            username=user.username,
+            temporary_password=temporary_password,
+            login_url=login_url,
+        )
+    finally:
+        # This runs in its own thread, which holds its own database connection
+        connections.close_all()
+
+
+def queue_temporary_password_email(user_id, temporary_password, login_url=None):
+    """
+    Send the temporary password email in the background once the current
+    transaction commits, so the request does not wait on the mail server.
+    """
+    def start_send():
+        threading.Thread(
+            target=_send_temporary_password_email_to_user,
+            args=(user_id, temporary_password, login_url),
+            daemon=True,
+        ).start()
+    
+    transaction.on_commit(start_send)
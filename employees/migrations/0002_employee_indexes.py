@@ -0,0 +1,43 @@
+# Generated by Django 5.2.8 on 2026-10-15 15:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employeedocument',
+            index=models.Index(fields=['employee', '-uploaded_at'], name='employees_e_employe_801b94_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employeedocument',
+            index=models.Index(fields=['document_type'], name='employees_e_documen_3808ed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employeenote',
+            index=models.Index(fields=['employee', '-created_at'], name='employees_e_employe_ab5e8f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employeenote',
+            index=models.Index(fields=['note_type'], name='employees_e_note_ty_647c5f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employeeprofile',
+            index=models.Index(fields=['status', 'employment_type'], name='employees_e_status_77edac_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employeeprofile',
+            index=models.Index(fields=['employment_type'], name='employees_e_employm_09537f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employeeprofile',
+            index=models.Index(fields=['created_at'], name='employees_e_created_5afbcd_idx'),
+        ),
+    ]
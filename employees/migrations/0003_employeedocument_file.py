@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-15 15:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0002_employee_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employeedocument',
+            name='file',
+            field=models.FileField(blank=True, null=True, upload_to='employee_documents/%Y/%m/'),
+        ),
+        migrations.AlterField(
+            model_name='employeedocument',
+            name='file_path',
+            field=models.CharField(blank=True, max_length=500),
+        ),
+    ]
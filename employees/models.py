@@ -6,16 +6,18 @@ User = get_user_model()
 
 class Position(models.Model):
     """Job positions within the company"""
-    title = models.CharField(max_length=100, unique=True)
-    description = models.TextField(blank=True)
-    level = models.CharField(max_length=50, choices=[
+    LEVEL_CHOICES = [
         ('INTERN', 'Intern'),
         ('JUNIOR', 'Junior'),
         ('SENIOR', 'Senior'),
         ('LEAD', 'Lead'),
         ('MANAGER', 'Manager'),
         ('DIRECTOR', 'Director'),
-    ], default='JUNIOR')
+    ]
+    
+    title = models.CharField(max_length=100, unique=True)
+    description = models.TextField(blank=True)
+    level = models.CharField(max_length=50, choices=LEVEL_CHOICES, default='JUNIOR')
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
@@ -26,17 +28,31 @@ class Position(models.Model):
 
 class EmployeeProfile(models.Model):
     """Extended employee profile information"""
+    GENDER_CHOICES = [
+        ('MALE', 'Male'),
+        ('FEMALE', 'Female'),
+        ('OTHER', 'Other'),
+        ('PREFER_NOT_TO_SAY', 'Prefer not to say'),
+    ]
+    EMPLOYMENT_TYPE_CHOICES = [
+        ('FULL_TIME', 'Full-time'),
+        ('PART_TIME', 'Part-time'),
+        ('CONTRACT', 'Contract'),
+        ('INTERN', 'Intern'),
+    ]
+    STATUS_CHOICES = [
+        ('ACTIVE', 'Active'),
+        ('ON_LEAVE', 'On Leave'),
+        ('TERMINATED', 'Terminated'),
+        ('RESIGNED', 'Resigned'),
+    ]
+    
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='employee_profile')
     position = models.ForeignKey(Position, on_delete=models.SET_NULL, null=True, blank=True)
     
     # Personal Information
     date_of_birth = models.DateField(null=True, blank=True)
-    gender = models.CharField(max_length=20, choices=[
-        ('MALE', 'Male'),
-        ('FEMALE', 'Female'),
-        ('OTHER', 'Other'),
-        ('PREFER_NOT_TO_SAY', 'Prefer not to say'),
-    ], blank=True)
+    gender = models.CharField(max_length=20, choices=GENDER_CHOICES, blank=True)
     
     # Contact Information
     emergency_contact_name = models.CharField(max_length=100, blank=True)
@@ -45,19 +61,9 @@ class EmployeeProfile(models.Model):
     
     # Employment Details
     salary = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
-    employment_type = models.CharField(max_length=20, choices=[
-        ('FULL_TIME', 'Full-time'),
-        ('PART_TIME', 'Part-time'),
-        ('CONTRACT', 'Contract'),
-        ('INTERN', 'Intern'),
-    ], default='FULL_TIME')
+    employment_type = models.CharField(max_length=20, choices=EMPLOYMENT_TYPE_CHOICES, default='FULL_TIME')
     
-    status = models.CharField(max_length=20, choices=[
-        ('ACTIVE', 'Active'),
-        ('ON_LEAVE', 'On Leave'),
-        ('TERMINATED', 'Terminated'),
-        ('RESIGNED', 'Resigned'),
-    ], default='ACTIVE')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='ACTIVE')
     
     # Supervisor relationship
     supervisor = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, 
@@ -70,6 +76,11 @@ class EmployeeProfile(models.Model):
     
     class Meta:
         ordering = ['user__last_name', 'user__first_name']
+        indexes = [
+            models.Index(fields=['status', 'employment_type']),
+            models.Index(fields=['employment_type']),
+            models.Index(fields=['created_at']),
+        ]
     
     def __str__(self):
         return f"{self.user.get_full_name() or self.user.username} - {self.position or 'No Position'}"
@@ -84,42 +95,55 @@ class EmployeeProfile(models.Model):
 
 class EmployeeDocument(models.Model):
     """Documents related to employees"""
-    employee = models.ForeignKey(EmployeeProfile, on_delete=models.CASCADE, related_name='documents')
-    document_type = models.CharField(max_length=50, choices=[
+    DOCUMENT_TYPE_CHOICES = [
         ('RESUME', 'Resume'),
         ('CONTRACT', 'Employment Contract'),
         ('ID_COPY', 'ID Copy'),
         ('CERTIFICATE', 'Certificate'),
         ('OTHER', 'Other'),
-    ])
+    ]
+    
+    employee = models.ForeignKey(EmployeeProfile, on_delete=models.CASCADE, related_name='documents')
+    document_type = models.CharField(max_length=50, choices=DOCUMENT_TYPE_CHOICES)
     title = models.CharField(max_length=200)
-    file_path = models.CharField(max_length=500)  # Store file path or URL
+    file = models.FileField(upload_to='employee_documents/%Y/%m/', null=True, blank=True)
+    file_path = models.CharField(max_length=500, blank=True)  # External link or legacy path when no file is stored
     uploaded_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
         ordering = ['-uploaded_at']
+        indexes = [
+            models.Index(fields=['employee', '-uploaded_at']),
+            models.Index(fields=['document_type']),
+        ]
     
     def __str__(self):
         return f"{self.employee.full_name} - {self.title}"
 
 class EmployeeNote(models.Model):
     """Notes and comments about employees"""
-    employee = models.ForeignKey(EmployeeProfile, on_delete=models.CASCADE, related_name='notes')
-    author = models.ForeignKey(User, on_delete=models.CASCADE)
-    note = models.TextField()
-    note_type = models.CharField(max_length=20, choices=[
+    NOTE_TYPE_CHOICES = [
         ('GENERAL', 'General'),
         ('PERFORMANCE', 'Performance'),
         ('DISCIPLINARY', 'Disciplinary'),
         ('ACHIEVEMENT', 'Achievement'),
         ('TRAINING', 'Training'),
-    ], default='GENERAL')
+    ]
+    
+    employee = models.ForeignKey(EmployeeProfile, on_delete=models.CASCADE, related_name='notes')
+    author = models.ForeignKey(User, on_delete=models.CASCADE)
+    note = models.TextField()
+    note_type = models.CharField(max_length=20, choices=NOTE_TYPE_CHOICES, default='GENERAL')
     is_confidential = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['employee', '-created_at']),
+            models.Index(fields=['note_type']),
+        ]
     
     def __str__(self):
         return f"{self.employee.full_name} - {self.get_note_type_display()} Note"
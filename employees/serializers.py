@@ -1,11 +1,55 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import BooleanField, Case, Prefetch, Q, Value, When
+from django.db.models.functions import Coalesce, Concat, NullIf, Trim
+from drf_spectacular.openapi import OpenApiTypes
+from drf_spectacular.utils import extend_schema_field
 from .models import EmployeeProfile, Position, EmployeeDocument, EmployeeNote
 from accounts.serializers import UserSerializer
-from .email_utils import send_temporary_password_email
 
 User = get_user_model()
 
+# Choice labels for the profile serializers, resolved once instead of per field per row
+PROFILE_CHOICE_DISPLAYS = {
+    'employment_type': dict(EmployeeProfile.EMPLOYMENT_TYPE_CHOICES),
+    'status': dict(EmployeeProfile.STATUS_CHOICES),
+    'gender': dict(EmployeeProfile.GENDER_CHOICES),
+}
+
+
+@extend_schema_field(OpenApiTypes.STR)
+class ProfileChoiceDisplayField(serializers.Field):
+    """Read-only label for a profile choice field, looked up in PROFILE_CHOICE_DISPLAYS"""
+
+    def __init__(self, choice_field, **kwargs):
+        self.choice_field = choice_field
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance):
+        value = getattr(instance, self.choice_field)
+        return PROFILE_CHOICE_DISPLAYS[self.choice_field].get(value, value)
+
+
+def annotate_profile_summary(queryset):
+    """
+    Compute full_name and is_active_employee in SQL for list serializers,
+    mirroring the EmployeeProfile properties of the same names
+    """
+    return queryset.annotate(
+        annotated_full_name=Coalesce(
+            NullIf(Trim(Concat('user__first_name', Value(' '), 'user__last_name')), Value('')),
+            'user__username',
+        ),
+        annotated_is_active_employee=Case(
+            When(Q(status='ACTIVE') & Q(user__is_active=True), then=Value(True)),
+            default=Value(False),
+            output_field=BooleanField(),
+        ),
+    )
+
 class PositionSerializer(serializers.ModelSerializer):
     """Serializer for job positions"""
     level_display = serializers.CharField(source='get_level_display', read_only=True)
@@ -21,17 +65,41 @@ class EmployeeDocumentSerializer(serializers.ModelSerializer):
     """Serializer for employee documents"""
     document_type_display = serializers.CharField(source='get_document_type_display', read_only=True)
     uploaded_by_name = serializers.CharField(source='uploaded_by.get_full_name', read_only=True)
+    file_url = serializers.SerializerMethodField()
     
     class Meta:
         model = EmployeeDocument
         fields = [
             'id', 'document_type', 'document_type_display', 'title', 
-            'file_path', 'uploaded_by', 'uploaded_by_name', 'uploaded_at'
+            'file', 'file_url', 'file_path', 'uploaded_by', 'uploaded_by_name', 'uploaded_at'
         ]
         extra_kwargs = {
+            'file': {'write_only': True},
             'uploaded_by': {'read_only': True},
             'uploaded_at': {'read_only': True},
         }
+    
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Join the uploader, loading only the name columns uploaded_by_name needs"""
+        return queryset.select_related('uploaded_by').only(
+            'id', 'employee', 'document_type', 'title', 'file', 'file_path', 'uploaded_by', 'uploaded_at',
+            'uploaded_by__first_name', 'uploaded_by__last_name',
+        )
+    
+    def validate(self, attrs):
+        if self.instance is None and not attrs.get('file') and not attrs.get('file_path'):
+            raise serializers.ValidationError('Upload a file or provide a file path.')
+        return attrs
+    
+    def get_file_url(self, obj):
+        # The storage backend builds the URL, so cloud storages hand out direct links
+        if obj.file:
+            request = self.context.get('request')
+            if request:
+                return request.build_absolute_uri(obj.file.url)
+            return obj.file.url
+        return obj.file_path or None
 
 class EmployeeNoteSerializer(serializers.ModelSerializer):
     """Serializer for employee notes"""
@@ -48,6 +116,14 @@ class EmployeeNoteSerializer(serializers.ModelSerializer):
             'author': {'read_only': True},
             'created_at': {'read_only': True},
         }
+    
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Join the author, loading only the name columns author_name needs"""
+        return queryset.select_related('author').only(
+            'id', 'employee', 'note', 'note_type', 'is_confidential', 'author', 'created_at',
+            'author__first_name', 'author__last_name',
+        )
 
 class EmployeeProfileDetailSerializer(serializers.ModelSerializer):
     """Detailed serializer for employee profile"""
@@ -60,9 +136,9 @@ class EmployeeProfileDetailSerializer(serializers.ModelSerializer):
     # Display fields
     full_name = serializers.CharField(read_only=True)
     is_active_employee = serializers.BooleanField(read_only=True)
-    employment_type_display = serializers.CharField(source='get_employment_type_display', read_only=True)
-    status_display = serializers.CharField(source='get_status_display', read_only=True)
-    gender_display = serializers.CharField(source='get_gender_display', read_only=True)
+    employment_type_display = ProfileChoiceDisplayField('employment_type')
+    status_display = ProfileChoiceDisplayField('status')
+    gender_display = ProfileChoiceDisplayField('gender')
     
     # Related data
     documents = EmployeeDocumentSerializer(many=True, read_only=True)
@@ -83,6 +159,14 @@ class EmployeeProfileDetailSerializer(serializers.ModelSerializer):
             'updated_at': {'read_only': True},
         }
     
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Load every relation this serializer renders; views using it should apply this"""
+        return queryset.select_related('user', 'position', 'supervisor').prefetch_related(
+            Prefetch('documents', queryset=EmployeeDocumentSerializer.setup_eager_loading(EmployeeDocument.objects.all())),
+            Prefetch('notes', queryset=EmployeeNoteSerializer.setup_eager_loading(EmployeeNote.objects.all())),
+        )
+    
     def update(self, instance, validated_data):
         position_id = validated_data.pop('position_id', None)
         supervisor_id = validated_data.pop('supervisor_id', None)
@@ -112,10 +196,10 @@ class EmployeeProfileListSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     position_title = serializers.CharField(source='position.title', read_only=True)
     supervisor_name = serializers.CharField(source='supervisor.get_full_name', read_only=True)
-    full_name = serializers.CharField(read_only=True)
-    is_active_employee = serializers.BooleanField(read_only=True)
-    employment_type_display = serializers.CharField(source='get_employment_type_display', read_only=True)
-    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    full_name = serializers.CharField(source='annotated_full_name', read_only=True)
+    is_active_employee = serializers.BooleanField(source='annotated_is_active_employee', read_only=True)
+    employment_type_display = ProfileChoiceDisplayField('employment_type')
+    status_display = ProfileChoiceDisplayField('status')
     
     class Meta:
         model = EmployeeProfile
@@ -124,6 +208,20 @@ class EmployeeProfileListSerializer(serializers.ModelSerializer):
             'employment_type', 'employment_type_display', 'status', 'status_display',
             'is_active_employee', 'created_at', 'updated_at'
         ]
+    
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Join the rendered relations and load only the columns this serializer reads"""
+        user_columns = [
+            f'user__{field}' for field in UserSerializer.Meta.fields
+            if field not in ('password', 'profile_photo_url')
+        ]
+        queryset = queryset.select_related('user', 'position', 'supervisor').only(
+            'id', 'employment_type', 'status', 'created_at', 'updated_at',
+            'position__title', 'supervisor__first_name', 'supervisor__last_name',
+            *user_columns,
+        )
+        return annotate_profile_summary(queryset)
 
 
 class ColleagueSerializer(serializers.ModelSerializer):
@@ -133,8 +231,8 @@ class ColleagueSerializer(serializers.ModelSerializer):
     email = serializers.EmailField(source='user.email', read_only=True)
     department = serializers.CharField(source='user.department', read_only=True)
     position_title = serializers.CharField(source='position.title', read_only=True)
-    full_name = serializers.CharField(read_only=True)
-    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    full_name = serializers.CharField(source='annotated_full_name', read_only=True)
+    status_display = ProfileChoiceDisplayField('status')
 
     class Meta:
         model = EmployeeProfile
@@ -143,6 +241,10 @@ class ColleagueSerializer(serializers.ModelSerializer):
             'position_title', 'full_name', 'status', 'status_display'
         ]
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return annotate_profile_summary(queryset.select_related('user', 'position'))
+
 class EmployeeCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating new employee with user account"""
     # User fields
@@ -169,14 +271,14 @@ class EmployeeCreateSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id']
     
-    def validate_username(self, value):
-        if User.objects.filter(username=value).exists():
-            raise serializers.ValidationError("Username already exists.")
+    def validate_position_id(self, value):
+        if value and not Position.objects.filter(id=value).exists():
+            raise serializers.ValidationError("Invalid position ID")
         return value
     
-    def validate_email(self, value):
-        if User.objects.filter(email=value).exists():
-            raise serializers.ValidationError("Email already exists.")
+    def validate_supervisor_id(self, value):
+        if value and not User.objects.filter(id=value, role='HR').exists():
+            raise serializers.ValidationError("Invalid supervisor ID or supervisor is not HR")
         return value
     
     def to_representation(self, instance):
@@ -184,21 +286,24 @@ class EmployeeCreateSerializer(serializers.ModelSerializer):
         data = EmployeeProfileDetailSerializer(instance).data
         
         # Add email status if available
-        if hasattr(instance, '_email_sent'):
-            data['email_sent'] = instance._email_sent
+        if hasattr(instance, '_email_queued'):
+            data['email_queued'] = instance._email_queued
         if hasattr(instance, '_temporary_password'):
             data['temporary_password'] = instance._temporary_password
         
         return data
     
     def create(self, validated_data):
+        from .email_utils import queue_temporary_password_email
+        
         # Extract user data
         user_data = {
-            'username': validated_data.pop('username'),
-            'email': validated_data.pop('email'),
+            'username': User.normalize_username(validated_data.pop('username')),
+            'email': User.objects.normalize_email(validated_data.pop('email')),
             'first_name': validated_data.pop('first_name'),
             'last_name': validated_data.pop('last_name'),
-            'role': 'EMPLOYEE'
+            'role': 'EMPLOYEE',
+            'must_change_password': True  # Require password change on first login
         }
         
         # Extract optional user fields
@@ -209,50 +314,32 @@ class EmployeeCreateSerializer(serializers.ModelSerializer):
             
         password = validated_data.pop('password')
         
-        # Handle position and supervisor
-        position_id = validated_data.pop('position_id', None)
-        supervisor_id = validated_data.pop('supervisor_id', None)
-        
-        # Create user
-        user = User.objects.create_user(**user_data)
-        user.set_password(password)
-        user.must_change_password = True  # Require password change on first login
-        user.save()
-        
-        # Create employee profile
-        employee_profile = EmployeeProfile.objects.create(
-            user=user,
-            **validated_data
-        )
-        
-        # Set position and supervisor
-        if position_id:
-            try:
-                position = Position.objects.get(id=position_id)
-                employee_profile.position = position
-            except Position.DoesNotExist:
-                pass
-        
-        if supervisor_id:
+        with transaction.atomic():
+            # Create user with a single INSERT; duplicates are caught by the
+            # unique constraints on username and email
+            user = User(**user_data)
+            user.set_password(password)
             try:
-                supervisor = User.objects.get(id=supervisor_id, role='HR')
-                employee_profile.supervisor = supervisor
-            except User.DoesNotExist:
-                pass
-        
-        employee_profile.save()
-        
-        # Send temporary password email
-        employee_full_name = f"{user.first_name} {user.last_name}"
-        email_sent = send_temporary_password_email(
-            employee_email=user.email,
-            employee_name=employee_full_name,
-            username=user.username,
-            temporary_password=password
-        )
+                # Savepoint, so the transaction stays usable to find the conflict
+                with transaction.atomic():
+                    user.save()
+            except IntegrityError:
+                if user.email and User.objects.filter(email=user.email).exists():
+                    raise serializers.ValidationError({'email': ["Email already exists."]})
+                raise serializers.ValidationError({'username': ["Username already exists."]})
+            
+            # Create employee profile; position_id and supervisor_id were
+            # checked during validation, so assign the keys directly
+            employee_profile = EmployeeProfile.objects.create(
+                user=user,
+                **validated_data
+            )
+            
+            # Queue temporary password email; it is sent after the commit
+            queue_temporary_password_email(user.pk, password)
         
         # Store email status in a custom attribute for the response
-        employee_profile._email_sent = email_sent
+        employee_profile._email_queued = True
         employee_profile._temporary_password = password
         
         return employee_profile
\ No newline at end of file
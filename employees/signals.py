@@ -0,0 +1,32 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import EmployeeProfile, Position
+
+EMPLOYEE_STATS_CACHE_KEY = 'employee-statistics'
+EMPLOYEE_STATS_CACHE_TIMEOUT = 300
+
+
+def invalidate_employee_statistics():
+    """Drop the cached employee_statistics payload so the next request recomputes it"""
+    cache.delete(EMPLOYEE_STATS_CACHE_KEY)
+
+
+# Profiles feed every breakdown and positions the position breakdown
+@receiver(post_save, sender=EmployeeProfile)
+@receiver(post_delete, sender=EmployeeProfile)
+@receiver(post_save, sender=Position)
+@receiver(post_delete, sender=Position)
+def employee_statistics_changed(sender, **kwargs):
+    invalidate_employee_statistics()
+
+
+# Users feed the department breakdown; logins only touch last_login, so skip those
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def employee_user_changed(sender, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    invalidate_employee_statistics()
@@ -1,10 +1,18 @@
+import logging
+import secrets
+import string
+
 from rest_framework import generics, status, permissions
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from django.db.models import Q, Count
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q, Count, F
 from django.contrib.auth import get_user_model
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 
 from .models import EmployeeProfile, Position, EmployeeDocument, EmployeeNote
 from .serializers import (
@@ -12,9 +20,11 @@ from .serializers import (
     EmployeeCreateSerializer, PositionSerializer, EmployeeDocumentSerializer,
     EmployeeNoteSerializer, ColleagueSerializer
 )
+from .signals import EMPLOYEE_STATS_CACHE_KEY, EMPLOYEE_STATS_CACHE_TIMEOUT, invalidate_employee_statistics
 from accounts.views import IsHRPermission
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
 
 # Employee CRUD Operations
 
@@ -23,7 +33,7 @@ class EmployeeListCreateAPIView(generics.ListCreateAPIView):
     permission_classes = [IsHRPermission]
     
     def get_queryset(self):
-        queryset = EmployeeProfile.objects.select_related('user', 'position', 'supervisor').all()
+        queryset = EmployeeProfileListSerializer.setup_eager_loading(EmployeeProfile.objects.all())
         
         # Filter parameters
         search = self.request.query_params.get('search')
@@ -60,20 +70,30 @@ class EmployeeListCreateAPIView(generics.ListCreateAPIView):
             return EmployeeCreateSerializer
         return EmployeeProfileListSerializer
     
-    def perform_create(self, serializer):
-        print(f"Creating employee with data: {self.request.data}")
-        serializer.save()
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get('compact', '').lower() not in ('1', 'true'):
+            return super().list(request, *args, **kwargs)
         
+        # Compact mode: flat rows straight from the database, without per-row serializers
+        queryset = self.filter_queryset(self.get_queryset()).values(
+            'id', 'user_id', 'employment_type', 'status',
+            username=F('user__username'), email=F('user__email'),
+            employee_id=F('user__employee_id'), department=F('user__department'),
+            position_title=F('position__title'), full_name=F('annotated_full_name'),
+            is_active_employee=F('annotated_is_active_employee'),
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(list(queryset))
+    
     def create(self, request, *args, **kwargs):
-        print(f"Received POST request to create employee")
-        print(f"Request data: {request.data}")
         serializer = self.get_serializer(data=request.data)
-        print(f"Validating data...")
         if not serializer.is_valid():
-            print(f"Validation errors: {serializer.errors}")
+            # The payload carries the new user's password, so only the errors are logged
+            logger.debug("Employee creation rejected: %s", serializer.errors)
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
-        print(f"Data is valid, creating employee...")
         self.perform_create(serializer)
         
         # Get the created instance and add email info to response
@@ -81,20 +101,17 @@ class EmployeeListCreateAPIView(generics.ListCreateAPIView):
         instance = serializer.instance
         
         # Include email status in response
-        if hasattr(instance, '_email_sent'):
-            response_data['email_sent'] = instance._email_sent
+        if hasattr(instance, '_email_queued'):
+            response_data['email_queued'] = instance._email_queued
             response_data['temporary_password'] = instance._temporary_password
-            if instance._email_sent:
-                response_data['message'] = f"Employee created successfully. Login credentials have been sent to {instance.user.email}"
-            else:
-                response_data['message'] = "Employee created successfully, but email could not be sent. Please provide credentials manually."
+            response_data['message'] = f"Employee created successfully. Login credentials are being sent to {instance.user.email}"
         
         headers = self.get_success_headers(response_data)
         return Response(response_data, status=status.HTTP_201_CREATED, headers=headers)
 
 class EmployeeDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or delete employee (HR only)"""
-    queryset = EmployeeProfile.objects.select_related('user', 'position', 'supervisor').prefetch_related('documents', 'notes')
+    queryset = EmployeeProfileDetailSerializer.setup_eager_loading(EmployeeProfile.objects.all())
     serializer_class = EmployeeProfileDetailSerializer
     permission_classes = [IsHRPermission]
     
@@ -108,11 +125,12 @@ class EmployeeDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
                 'error': 'You cannot delete your own account. Please contact another HR manager.'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Soft delete: deactivate instead of hard delete
+        # Soft delete: deactivate instead of hard delete, writing only the changed columns
         employee.status = 'TERMINATED'
         employee.user.is_active = False
-        employee.save()
-        employee.user.save()
+        with transaction.atomic():
+            employee.save(update_fields=['status', 'updated_at'])
+            employee.user.save(update_fields=['is_active'])
         
         return Response({
             'message': f'Employee {employee.full_name} has been deactivated successfully.'
@@ -124,11 +142,14 @@ class EmployeeProfileAPIView(generics.RetrieveUpdateAPIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_object(self):
-        employee_profile, created = EmployeeProfile.objects.get_or_create(
-            user=self.request.user,
-            defaults={'status': 'ACTIVE', 'employment_type': 'FULL_TIME'}
-        )
-        return employee_profile
+        queryset = EmployeeProfileDetailSerializer.setup_eager_loading(EmployeeProfile.objects.all())
+        try:
+            return queryset.get(user_id=self.request.user.id)
+        except EmployeeProfile.DoesNotExist:
+            # Users created outside the HR flow have no profile yet
+            return EmployeeProfile.objects.create(
+                user=self.request.user, status='ACTIVE', employment_type='FULL_TIME'
+            )
 
 
 class ColleagueListAPIView(generics.ListAPIView):
@@ -138,8 +159,7 @@ class ColleagueListAPIView(generics.ListAPIView):
 
     def get_queryset(self):
         return (
-            EmployeeProfile.objects
-            .select_related('user', 'position')
+            ColleagueSerializer.setup_eager_loading(EmployeeProfile.objects.all())
             .filter(user__is_active=True)
             .exclude(user=self.request.user)
             .order_by('user__last_name', 'user__first_name')
@@ -161,30 +181,32 @@ class PositionDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
 
 # Employee Documents
 
+def employee_documents_queryset(request, employee_id):
+    """Documents of one employee, filtered by key so the profile itself is never loaded"""
+    documents = EmployeeDocument.objects.filter(employee_id=employee_id)
+    
+    # HR can see all documents, employees can only see their own
+    if not request.user.is_hr:
+        documents = documents.filter(employee__user=request.user)
+    return EmployeeDocumentSerializer.setup_eager_loading(documents)
+
 class EmployeeDocumentListCreateAPIView(generics.ListCreateAPIView):
     """List or create employee documents"""
     serializer_class = EmployeeDocumentSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        employee_id = self.kwargs['employee_id']
-        employee = get_object_or_404(EmployeeProfile, id=employee_id)
-        
-        # HR can see all documents, employees can only see their own
-        if self.request.user.is_hr or employee.user == self.request.user:
-            return employee.documents.all()
-        else:
-            return EmployeeDocument.objects.none()
+        return employee_documents_queryset(self.request, self.kwargs['employee_id'])
     
     def perform_create(self, serializer):
         employee_id = self.kwargs['employee_id']
         employee = get_object_or_404(EmployeeProfile, id=employee_id)
         
         # HR can add documents for any employee, employees can add to their own profile
-        if self.request.user.is_hr or employee.user == self.request.user:
+        if self.request.user.is_hr or employee.user_id == self.request.user.id:
             serializer.save(employee=employee, uploaded_by=self.request.user)
         else:
-            raise permissions.PermissionDenied("You can only manage your own documents.")
+            raise PermissionDenied("You can only manage your own documents.")
 
 class EmployeeDocumentDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or delete employee document"""
@@ -192,13 +214,7 @@ class EmployeeDocumentDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        employee_id = self.kwargs['employee_id']
-        employee = get_object_or_404(EmployeeProfile, id=employee_id)
-        
-        if self.request.user.is_hr or employee.user == self.request.user:
-            return employee.documents.all()
-        else:
-            return EmployeeDocument.objects.none()
+        return employee_documents_queryset(self.request, self.kwargs['employee_id'])
 
 # Employee Notes
 
@@ -208,9 +224,9 @@ class EmployeeNoteListCreateAPIView(generics.ListCreateAPIView):
     permission_classes = [IsHRPermission]
     
     def get_queryset(self):
-        employee_id = self.kwargs['employee_id']
-        employee = get_object_or_404(EmployeeProfile, id=employee_id)
-        return employee.notes.all()
+        return EmployeeNoteSerializer.setup_eager_loading(
+            EmployeeNote.objects.filter(employee_id=self.kwargs['employee_id'])
+        )
     
     def perform_create(self, serializer):
         employee_id = self.kwargs['employee_id']
@@ -223,52 +239,60 @@ class EmployeeNoteDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsHRPermission]
     
     def get_queryset(self):
-        employee_id = self.kwargs['employee_id']
-        employee = get_object_or_404(EmployeeProfile, id=employee_id)
-        return employee.notes.all()
+        return EmployeeNoteSerializer.setup_eager_loading(
+            EmployeeNote.objects.filter(employee_id=self.kwargs['employee_id'])
+        )
 
 # Statistics and Reports
 
+STATS_BREAKDOWN_LIMIT = 50
+
 @api_view(['GET'])
 @permission_classes([IsHRPermission])
 def employee_statistics(request):
     """Get comprehensive employee statistics"""
-    total_employees = EmployeeProfile.objects.count()
-    active_employees = EmployeeProfile.objects.filter(status='ACTIVE').count()
+    stats = cache.get(EMPLOYEE_STATS_CACHE_KEY)
+    if stats is not None:
+        return Response(stats)
     
-    # Status breakdown
-    status_breakdown = EmployeeProfile.objects.values('status').annotate(
+    # Status breakdown; every profile has exactly one status, so the totals come from it
+    status_breakdown = list(EmployeeProfile.objects.values('status').annotate(
         count=Count('id')
-    ).order_by('status')
+    ).order_by('status'))
+    total_employees = sum(row['count'] for row in status_breakdown)
+    active_employees = sum(row['count'] for row in status_breakdown if row['status'] == 'ACTIVE')
     
     # Employment type breakdown
     employment_breakdown = EmployeeProfile.objects.values('employment_type').annotate(
         count=Count('id')
     ).order_by('employment_type')
     
-    # Department breakdown
-    department_breakdown = EmployeeProfile.objects.values(
+    # Department and position breakdowns grow with the data, so only the largest
+    # groups are returned and the rest is reported as a single count
+    department_breakdown = list(EmployeeProfile.objects.values(
         'user__department'
     ).annotate(
         count=Count('id')
-    ).order_by('user__department')
+    ).order_by('-count', 'user__department')[:STATS_BREAKDOWN_LIMIT])
     
-    # Position breakdown
-    position_breakdown = EmployeeProfile.objects.values(
+    position_breakdown = list(EmployeeProfile.objects.values(
         'position__title'
     ).annotate(
         count=Count('id')
-    ).order_by('position__title')
+    ).order_by('-count', 'position__title')[:STATS_BREAKDOWN_LIMIT])
     
     stats = {
         'total_employees': total_employees,
         'active_employees': active_employees,
         'inactive_employees': total_employees - active_employees,
-        'status_breakdown': list(status_breakdown),
+        'status_breakdown': status_breakdown,
         'employment_breakdown': list(employment_breakdown),
-        'department_breakdown': list(department_breakdown),
-        'position_breakdown': list(position_breakdown),
+        'department_breakdown': department_breakdown,
+        'department_other_count': total_employees - sum(row['count'] for row in department_breakdown),
+        'position_breakdown': position_breakdown,
+        'position_other_count': total_employees - sum(row['count'] for row in position_breakdown),
     }
+    cache.set(EMPLOYEE_STATS_CACHE_KEY, stats, EMPLOYEE_STATS_CACHE_TIMEOUT)
     
     return Response(stats)
 
@@ -283,24 +307,27 @@ def bulk_update_employees(request):
         return Response({'error': 'No employee IDs provided'}, status=status.HTTP_400_BAD_REQUEST)
     
     employees = EmployeeProfile.objects.filter(id__in=employee_ids)
-    updated_count = employees.count()
     
     # Update allowed fields
     allowed_fields = ['status', 'employment_type', 'supervisor']
+    changes = {field: value for field, value in update_data.items() if field in allowed_fields}
+    
+    if 'supervisor' in changes:
+        supervisor_id = changes.pop('supervisor')
+        if not User.objects.filter(id=supervisor_id, role='HR').exists():
+            return Response(
+                {'error': f'Invalid supervisor ID: {supervisor_id}'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        changes['supervisor_id'] = supervisor_id
     
-    for field, value in update_data.items():
-        if field in allowed_fields:
-            if field == 'supervisor':
-                try:
-                    supervisor = User.objects.get(id=value, role='HR')
-                    employees.update(supervisor=supervisor)
-                except User.DoesNotExist:
-                    return Response(
-                        {'error': f'Invalid supervisor ID: {value}'}, 
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-            else:
-                employees.update(**{field: value})
+    # Apply every change in one UPDATE; update() skips auto_now, so set updated_at here
+    if changes:
+        updated_count = employees.update(updated_at=timezone.now(), **changes)
+        # update() sends no post_save, so clear the cached statistics here
+        invalidate_employee_statistics()
+    else:
+        updated_count = employees.count()
     
     return Response({
         'message': f'Successfully updated {updated_count} employees',
@@ -308,13 +335,28 @@ def bulk_update_employees(request):
     })
 
 
+TEMPORARY_PASSWORD_ALPHABET = string.ascii_letters + string.digits + '@#$%'
+# Random bytes at or above this value would bias the modulo mapping, so they are skipped
+_TEMPORARY_PASSWORD_BYTE_LIMIT = 256 - 256 % len(TEMPORARY_PASSWORD_ALPHABET)
+
+
+def generate_temporary_password(length=12):
+    """Random password drawn from one entropy read per batch rather than one per character"""
+    password = []
+    while len(password) < length:
+        for byte in secrets.token_bytes(length * 2):
+            if byte < _TEMPORARY_PASSWORD_BYTE_LIMIT:
+                password.append(TEMPORARY_PASSWORD_ALPHABET[byte % len(TEMPORARY_PASSWORD_ALPHABET)])
+                if len(password) == length:
+                    break
+    return ''.join(password)
+
+
 @api_view(['POST'])
 @permission_classes([IsHRPermission])
 def resend_employee_credentials(request, employee_id):
     """Resend login credentials email to an employee"""
-    from .email_utils import send_temporary_password_email
-    import secrets
-    import string
+    from .email_utils import queue_temporary_password_email
     
     try:
         employee_profile = EmployeeProfile.objects.select_related('user').get(id=employee_id)
@@ -327,37 +369,22 @@ def resend_employee_credentials(request, employee_id):
             }, status=status.HTTP_400_BAD_REQUEST)
         
         # Generate new temporary password
-        alphabet = string.ascii_letters + string.digits + '@#$%'
-        new_password = ''.join(secrets.choice(alphabet) for i in range(12))
+        new_password = generate_temporary_password()
         
         # Update user password
         user.set_password(new_password)
         user.must_change_password = True
-        user.save()
+        user.save(update_fields=['password', 'must_change_password'])
         
-        # Send email
-        employee_full_name = f"{user.first_name} {user.last_name}"
-        email_sent = send_temporary_password_email(
-            employee_email=user.email,
-            employee_name=employee_full_name,
-            username=user.username,
-            temporary_password=new_password
-        )
+        # Queue the email; it is sent in the background after the response
+        queue_temporary_password_email(user.pk, new_password)
         
-        if email_sent:
-            return Response({
-                'success': True,
-                'message': f'Login credentials have been sent to {user.email}',
-                'email': user.email,
-                'temporary_password': new_password
-            })
-        else:
-            return Response({
-                'success': False,
-                'message': 'Failed to send email. Please share credentials manually.',
-                'email': user.email,
-                'temporary_password': new_password
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        return Response({
+            'success': True,
+            'message': f'Login credentials are being sent to {user.email}',
+            'email': user.email,
+            'temporary_password': new_password
+        }, status=status.HTTP_202_ACCEPTED)
             
     except EmployeeProfile.DoesNotExist:
         return Response({'error': 'Employee not found'}, status=status.HTTP_404_NOT_FOUND)
@@ -1,5 +1,5 @@
 from django.contrib.auth import get_user_model
-from django.db.models import Avg
+from django.db.models import Avg, Count
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from datetime import timedelta
@@ -171,33 +171,47 @@ class Feedback360ListCreateAPIView(generics.ListCreateAPIView):
         serializer.save(from_employee=self.request.user)
 
 
+def _relationship_rows(feedback_items):
+    """Feedback count and average rating per relationship, in choice order."""
+    rows = {
+        row['relationship']: row
+        for row in feedback_items.values('relationship').annotate(
+            count=Count('id'),
+            avg=Avg('rating'),
+        ).order_by()
+    }
+    return [
+        (relationship_label, rows[relationship_key])
+        for relationship_key, relationship_label in Feedback360.RELATIONSHIP_CHOICES
+        if relationship_key in rows
+    ]
+
+
 @api_view(['GET'])
 @permission_classes([IsHRPermission])
 def feedback_360_summary(request, review_id):
     feedback_items = Feedback360.objects.filter(performance_review_id=review_id)
+    totals = feedback_items.aggregate(total=Count('id'), avg=Avg('rating'))
 
-    if not feedback_items.exists():
+    if not totals['total']:
         return Response(
             {'review_id': review_id, 'total_feedback': 0, 'average_rating': 0, 'by_relationship': []},
             status=status.HTTP_200_OK,
         )
 
-    average_rating = feedback_items.aggregate(avg=Avg('rating'))['avg'] or 0
-    relationship_summary = []
-
-    for relationship_key, relationship_label in Feedback360.RELATIONSHIP_CHOICES:
-        subset = feedback_items.filter(relationship=relationship_key)
-        if subset.exists():
-            relationship_summary.append({
-                'relationship': relationship_label,
-                'count': subset.count(),
-                'average_rating': subset.aggregate(avg=Avg('rating'))['avg'] or 0,
-            })
+    relationship_summary = [
+        {
+            'relationship': relationship_label,
+            'count': row['count'],
+            'average_rating': row['avg'] or 0,
+        }
+        for relationship_label, row in _relationship_rows(feedback_items)
+    ]
 
     return Response({
         'review_id': review_id,
-        'total_feedback': feedback_items.count(),
-        'average_rating': round(float(average_rating), 2),
+        'total_feedback': totals['total'],
+        'average_rating': round(float(totals['avg'] or 0), 2),
         'by_relationship': relationship_summary,
     })
 
@@ -222,15 +236,14 @@ def employee_performance_report(request):
     feedback_average = feedback_items.aggregate(avg=Avg('rating'))['avg'] or 0
     latest_review = reviews.first()
 
-    relationship_breakdown = []
-    for relationship_key, relationship_label in Feedback360.RELATIONSHIP_CHOICES:
-        subset = feedback_items.filter(relationship=relationship_key)
-        if subset.exists():
-            relationship_breakdown.append({
-                'relationship': relationship_label,
-                'count': subset.count(),
-                'average_rating': round(float(subset.aggregate(avg=Avg('rating'))['avg'] or 0), 2),
-            })
+    relationship_breakdown = [
+        {
+            'relationship': relationship_label,
+            'count': row['count'],
+            'average_rating': round(float(row['avg'] or 0), 2),
+        }
+        for relationship_label, row in _relationship_rows(feedback_items)
+    ]
 
     recommendations = []
     if latest_review and latest_review.improvement_areas:
@@ -445,15 +458,14 @@ def my_performance_report(request):
 
     latest_review = reviews.first()
 
-    relationship_breakdown = []
-    for rel_key, rel_label in Feedback360.RELATIONSHIP_CHOICES:
-        subset = feedback_items.filter(relationship=rel_key)
-        if subset.exists():
-            relationship_breakdown.append({
-                'relationship': rel_label,
-                'count': subset.count(),
-                'average_rating': round(float(subset.aggregate(avg=Avg('rating'))['avg'] or 0), 2),
-            })
+    relationship_breakdown = [
+        {
+            'relationship': rel_label,
+            'count': row['count'],
+            'average_rating': round(float(row['avg'] or 0), 2),
+        }
+        for rel_label, row in _relationship_rows(feedback_items)
+    ]
 
     recommendations = []
     if latest_review and latest_review.improvement_areas:
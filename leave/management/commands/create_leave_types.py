@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 from leave.models import LeaveType
+from leave.signals import invalidate_leave_types
 
 
 class Command(BaseCommand):
@@ -65,32 +66,41 @@ class Command(BaseCommand):
             },
         ]
 
-        created_count = 0
-        existing_count = 0
+        names = [leave_data['name'] for leave_data in leave_types]
+        existing = set(
+            LeaveType.objects.filter(name__in=names).values_list('name', flat=True)
+        )
 
-        for leave_data in leave_types:
-            leave_type, created = LeaveType.objects.get_or_create(
+        to_create = [
+            LeaveType(
                 name=leave_data['name'],
-                defaults={
-                    'description': leave_data['description'],
-                    'max_days_per_year': leave_data['max_days_per_year'],
-                    'requires_approval': leave_data['requires_approval'],
-                    'advance_notice_days': leave_data['advance_notice_days'],
-                    'is_active': True
-                }
+                description=leave_data['description'],
+                max_days_per_year=leave_data['max_days_per_year'],
+                requires_approval=leave_data['requires_approval'],
+                advance_notice_days=leave_data['advance_notice_days'],
+                is_active=True
             )
-            
-            if created:
-                created_count += 1
+            for leave_data in leave_types
+            if leave_data['name'] not in existing
+        ]
+        # ignore_conflicts covers a concurrent run inserting the same name
+        LeaveType.objects.bulk_create(to_create, ignore_conflicts=True, batch_size=500)
+        # bulk_create skips post_save, so drop the cached leave types here
+        invalidate_leave_types()
+
+        for name in names:
+            if name in existing:
                 self.stdout.write(
-                    self.style.SUCCESS(f'✓ Created leave type: {leave_type.name}')
+                    self.style.WARNING(f'- Leave type already exists: {name}')
                 )
             else:
-                existing_count += 1
                 self.stdout.write(
-                    self.style.WARNING(f'- Leave type already exists: {leave_type.name}')
+                    self.style.SUCCESS(f'✓ Created leave type: {name}')
                 )
 
+        created_count = len(to_create)
+        existing_count = len(names) - created_count
+
         self.stdout.write(
             self.style.SUCCESS(
                 f'\n✓ Summary: {created_count} created, {existing_count} already existed'
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-15 15:39
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leave', '0002_alter_leavebalance_year'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='leaveapplication',
+            index=models.Index(fields=['employee', 'start_date'], name='leave_leave_employe_eb496d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leaveapplication',
+            index=models.Index(fields=['start_date', 'end_date'], name='leave_leave_start_d_6dd5d7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leaveapplication',
+            index=models.Index(fields=['status', '-applied_on'], name='leave_leave_status_fe86d3_idx'),
+        ),
+    ]
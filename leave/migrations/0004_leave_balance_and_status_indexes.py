@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-15 16:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leave', '0003_leaveapplication_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='leaveapplication',
+            index=models.Index(fields=['employee', 'status'], name='leave_leave_employe_abcd03_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leavebalance',
+            index=models.Index(fields=['year', 'user'], name='leave_leave_year_02f95f_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-15 16:15
+
+import leave.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leave', '0004_leave_balance_and_status_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='leavebalance',
+            name='year',
+            field=models.PositiveIntegerField(default=leave.models.current_year),
+        ),
+    ]
@@ -1,10 +1,14 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models.functions import Greatest
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator
 from datetime import date, timedelta
 
 User = get_user_model()
 
+def current_year():
+    return date.today().year
+
 class LeaveType(models.Model):
     """Different types of leave available"""
     name = models.CharField(max_length=50, unique=True)
@@ -34,7 +38,7 @@ class LeaveBalance(models.Model):
     """Employee's leave balance for different leave types"""
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='leave_balances')
     leave_type = models.ForeignKey(LeaveType, on_delete=models.CASCADE)
-    year = models.PositiveIntegerField(default=date.today().year)
+    year = models.PositiveIntegerField(default=current_year)
     
     total_allocated = models.DecimalField(
         max_digits=5, decimal_places=1, default=0,
@@ -52,6 +56,9 @@ class LeaveBalance(models.Model):
     class Meta:
         unique_together = ['user', 'leave_type', 'year']
         ordering = ['user', 'leave_type', 'year']
+        indexes = [
+            models.Index(fields=['year', 'user']),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.leave_type.name} ({self.year})"
@@ -120,6 +127,12 @@ class LeaveApplication(models.Model):
     
     class Meta:
         ordering = ['-applied_on']
+        indexes = [
+            models.Index(fields=['employee', 'start_date']),
+            models.Index(fields=['employee', 'status']),
+            models.Index(fields=['start_date', 'end_date']),
+            models.Index(fields=['status', '-applied_on']),
+        ]
     
     def __str__(self):
         return f"{self.employee.get_full_name() or self.employee.username} - {self.leave_type.name} ({self.start_date} to {self.end_date})"
@@ -155,37 +168,72 @@ class LeaveApplication(models.Model):
             return days
         return 0
     
+    # Status as last read from or written to the database; None for new instances
+    _saved_status = None
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'status' in field_names:
+            instance._saved_status = values[field_names.index('status')]
+        return instance
+    
     def save(self, *args, **kwargs):
         # Auto-calculate total days
         if not self.total_days:
             self.total_days = self.calculate_days()
         
+        # Loaded with status deferred; read the stored status before overwriting it
+        if self._saved_status is None and self.pk and not self._state.adding:
+            self._saved_status = type(self)._base_manager.filter(pk=self.pk).values_list(
+                'status', flat=True
+            ).first()
+        
         super().save(*args, **kwargs)
         
-        # Update leave balance if approved
-        if self.status == 'APPROVED' and self.employee:
+        # Update leave balance only when the application becomes approved, so
+        # later saves of an approved application don't count its days again
+        if self.status == 'APPROVED' and self._saved_status != 'APPROVED' and self.employee:
             self.update_leave_balance()
+        self._saved_status = self.status
     
     def update_leave_balance(self):
         """Update employee's leave balance when leave is approved"""
-        balance, created = LeaveBalance.objects.get_or_create(
-            user=self.employee,
-            leave_type=self.leave_type,
-            year=self.start_date.year,
-            defaults={
-                'total_allocated': self.leave_type.max_days_per_year
-            }
+        # Apply the change in the UPDATE itself so concurrent approvals can't
+        # overwrite each other's totals
+        days = models.Value(
+            self.total_days, output_field=models.DecimalField(max_digits=4, decimal_places=1)
         )
+        changes = {'used_days': models.F('used_days') + days}
         
-        if created:
-            balance.total_allocated = self.leave_type.max_days_per_year
+        # Move from pending to used; save() calls this before _saved_status
+        # is refreshed, so it still holds the status being left
+        if self._saved_status == 'PENDING':
+            changes['pending_days'] = Greatest(
+                models.Value(0, output_field=days.output_field),
+                models.F('pending_days') - days
+            )
         
-        # Move from pending to used
-        if hasattr(self, '_previous_status') and self._previous_status == 'PENDING':
-            balance.pending_days = max(0, balance.pending_days - self.total_days)
+        balances = LeaveBalance.objects.filter(
+            user=self.employee,
+            leave_type=self.leave_type,
+            year=self.start_date.year
+        )
+        if balances.update(**changes):
+            return
         
-        balance.used_days += self.total_days
-        balance.save()
+        try:
+            with transaction.atomic():
+                LeaveBalance.objects.create(
+                    user=self.employee,
+                    leave_type=self.leave_type,
+                    year=self.start_date.year,
+                    total_allocated=self.leave_type.max_days_per_year,
+                    used_days=self.total_days
+                )
+        except IntegrityError:
+            # Another approval created the balance first; apply on top of it
+            balances.update(**changes)
 
 class LeaveApplicationAttachment(models.Model):
     """Attachments for leave applications (medical certificates, etc.)"""
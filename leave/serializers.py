@@ -1,11 +1,18 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Prefetch, Value
+from django.db.models.functions import Coalesce, Concat, NullIf, Trim
+from django.utils import timezone
+from collections import defaultdict
 from datetime import date, timedelta
+from decimal import Decimal
 from .models import (
     LeaveType, LeaveBalance, LeaveApplication, 
     LeaveApplicationAttachment, LeaveApplicationComment
 )
 from .email_utils import send_leave_status_email
+from .signals import get_leave_types_by_id, invalidate_leave_reports
 from accounts.serializers import UserSerializer
 
 User = get_user_model()
@@ -37,6 +44,27 @@ class LeaveBalanceSerializer(serializers.ModelSerializer):
             'used_days', 'pending_days', 'available_days', 'utilization_percentage'
         ]
 
+class BalanceUserSerializer(serializers.Serializer):
+    """Minimal user representation for balance lists"""
+    id = serializers.IntegerField(read_only=True)
+    username = serializers.CharField(read_only=True)
+    full_name = serializers.SerializerMethodField()
+    
+    def get_full_name(self, obj):
+        return obj.get_full_name() or obj.username
+
+class LeaveBalanceListSerializer(LeaveBalanceSerializer):
+    """List serializer for leave balances, without the full user profile"""
+    user = BalanceUserSerializer(read_only=True)
+    
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Load each user and leave type once, users with only the columns rendered"""
+        return queryset.prefetch_related(
+            Prefetch('user', queryset=User.objects.only('id', 'username', 'first_name', 'last_name')),
+            'leave_type',
+        )
+
 class LeaveApplicationAttachmentSerializer(serializers.ModelSerializer):
     """Serializer for leave application attachments"""
     uploaded_by_name = serializers.CharField(source='uploaded_by.get_full_name', read_only=True)
@@ -101,15 +129,32 @@ class LeaveApplicationDetailSerializer(serializers.ModelSerializer):
             'approved_on': {'read_only': True},
         }
     
-    def get_comments(self, obj):
-        """Get comments based on user role"""
-        user = self.context['request'].user
-        comments = obj.comments.all()
-        
-        # Non-HR users cannot see internal comments
+    @staticmethod
+    def setup_eager_loading(queryset, user):
+        """
+        Load every relation this serializer renders, with internal comments
+        already left out of the prefetch for non-HR users
+        """
+        comments = LeaveApplicationComment.objects.select_related('author')
         if not user.is_hr:
             comments = comments.filter(is_internal=False)
-        
+        return queryset.select_related(
+            'employee', 'leave_type', 'approved_by', 'replacement_employee'
+        ).prefetch_related(
+            'attachments__uploaded_by',
+            Prefetch('comments', queryset=comments),
+        )
+    
+    def get_comments(self, obj):
+        """Get comments based on user role"""
+        # Reuse the filtered prefetch from setup_eager_loading when it is still
+        # there; DRF drops it after an update, so filter again in that case
+        if 'comments' in getattr(obj, '_prefetched_objects_cache', {}):
+            comments = obj.comments.all()
+        else:
+            comments = obj.comments.select_related('author')
+            if not self.context['request'].user.is_hr:
+                comments = comments.filter(is_internal=False)
         return LeaveApplicationCommentSerializer(comments, many=True).data
     
     def validate(self, data):
@@ -125,30 +170,25 @@ class LeaveApplicationDetailSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError('Cannot apply for leave in the past.')
         
         # Check advance notice if leave type is provided
-        if leave_type_id and start_date:
-            try:
-                leave_type = LeaveType.objects.get(id=leave_type_id)
+        if leave_type_id is not None:
+            leave_type = get_leave_types_by_id().get(leave_type_id)
+            if leave_type is None:
+                raise serializers.ValidationError({'leave_type_id': 'Invalid leave type ID'})
+            if start_date:
                 required_date = date.today() + timedelta(days=leave_type.advance_notice_days)
                 if start_date < required_date:
                     raise serializers.ValidationError(
                         f'This leave type requires {leave_type.advance_notice_days} days advance notice.'
                     )
-            except LeaveType.DoesNotExist:
-                raise serializers.ValidationError('Invalid leave type.')
+            # Reused by update() instead of fetching the leave type again
+            data['leave_type'] = leave_type
         
         return data
     
     def update(self, instance, validated_data):
-        leave_type_id = validated_data.pop('leave_type_id', None)
+        validated_data.pop('leave_type_id', None)
         replacement_employee_id = validated_data.pop('replacement_employee_id', None)
         
-        if leave_type_id is not None:
-            try:
-                leave_type = LeaveType.objects.get(id=leave_type_id)
-                instance.leave_type = leave_type
-            except LeaveType.DoesNotExist:
-                raise serializers.ValidationError({'leave_type_id': 'Invalid leave type ID'})
-        
         if replacement_employee_id is not None:
             if replacement_employee_id:
                 try:
@@ -167,7 +207,7 @@ class LeaveApplicationDetailSerializer(serializers.ModelSerializer):
 
 class LeaveApplicationListSerializer(serializers.ModelSerializer):
     """List serializer for leave applications"""
-    employee_name = serializers.SerializerMethodField()
+    employee_name = serializers.CharField(source='employee_full_name', read_only=True)
     employee_id = serializers.CharField(source='employee.employee_id', read_only=True)
     employee_username = serializers.CharField(source='employee.username', read_only=True)
     employee_email = serializers.CharField(source='employee.email', read_only=True)
@@ -184,14 +224,23 @@ class LeaveApplicationListSerializer(serializers.ModelSerializer):
             'applied_on', 'reason', 'approval_comments', 'approved_on'
         ]
     
-    def get_employee_name(self, obj):
-        """Get employee name with fallback to username"""
-        if obj.employee:
-            full_name = obj.employee.get_full_name()
-            if full_name and full_name.strip():
-                return full_name
-            return obj.employee.username
-        return "Unknown Employee"
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """
+        Join the employee and leave type, loading only the columns this
+        serializer reads; views using it should apply this
+        """
+        return queryset.select_related('employee', 'leave_type').only(
+            'id', 'employee', 'leave_type', 'start_date', 'end_date', 'total_days',
+            'status', 'priority', 'applied_on', 'reason', 'approval_comments', 'approved_on',
+            'employee__username', 'employee__email', 'employee__employee_id', 'leave_type__name',
+        ).annotate(
+            # Full name with fallback to username, as get_full_name() or username
+            employee_full_name=Coalesce(
+                NullIf(Trim(Concat('employee__first_name', Value(' '), 'employee__last_name')), Value('')),
+                'employee__username',
+            ),
+        )
     
     def get_leave_type_name(self, obj):
         """Get leave type name with proper handling"""
@@ -225,39 +274,68 @@ class LeaveApplicationCreateSerializer(serializers.ModelSerializer):
         
         # Validate leave type and advance notice
         if leave_type_id:
-            try:
-                leave_type = LeaveType.objects.get(id=leave_type_id)
-                required_date = date.today() + timedelta(days=leave_type.advance_notice_days)
-                if start_date < required_date:
-                    raise serializers.ValidationError(
-                        f'This leave type requires {leave_type.advance_notice_days} days advance notice.'
-                    )
-            except LeaveType.DoesNotExist:
+            leave_type = get_leave_types_by_id().get(leave_type_id)
+            if leave_type is None:
                 raise serializers.ValidationError('Invalid leave type.')
+            required_date = date.today() + timedelta(days=leave_type.advance_notice_days)
+            if start_date < required_date:
+                raise serializers.ValidationError(
+                    f'This leave type requires {leave_type.advance_notice_days} days advance notice.'
+                )
+            # Keep the instance so create() doesn't look it up again
+            data['leave_type'] = leave_type
+        
+        replacement_employee_id = data.pop('replacement_employee_id', None)
+        if replacement_employee_id:
+            try:
+                data['replacement_employee'] = User.objects.get(id=replacement_employee_id)
+            except User.DoesNotExist:
+                raise serializers.ValidationError({'replacement_employee_id': 'Invalid employee ID'})
         
         return data
     
     def create(self, validated_data):
-        leave_type_id = validated_data.pop('leave_type_id')
-        replacement_employee_id = validated_data.pop('replacement_employee_id', None)
+        validated_data.pop('leave_type_id')
         
-        leave_type = LeaveType.objects.get(id=leave_type_id)
-        
-        leave_application = LeaveApplication.objects.create(
+        return LeaveApplication.objects.create(
             employee=self.context['request'].user,
-            leave_type=leave_type,
             **validated_data
         )
-        
-        if replacement_employee_id:
-            try:
-                replacement = User.objects.get(id=replacement_employee_id)
-                leave_application.replacement_employee = replacement
-                leave_application.save()
-            except User.DoesNotExist:
-                pass
-        
-        return leave_application
+
+def _apply_approvals_to_balances(applications):
+    """Move approved pending days into used days with batched balance writes"""
+    deltas = defaultdict(Decimal)
+    allowances = {}
+    for app in applications:
+        key = (app.employee_id, app.leave_type_id, app.start_date.year)
+        deltas[key] += app.total_days
+        allowances[key] = app.leave_type.max_days_per_year
+    
+    user_ids, leave_type_ids, years = (set(part) for part in zip(*deltas))
+    balances = LeaveBalance.objects.select_for_update().filter(
+        user_id__in=user_ids, leave_type_id__in=leave_type_ids, year__in=years
+    )
+    
+    to_update = []
+    for balance in balances:
+        key = (balance.user_id, balance.leave_type_id, balance.year)
+        if key not in deltas:
+            continue
+        days = deltas.pop(key)
+        balance.used_days += days
+        balance.pending_days = max(0, balance.pending_days - days)
+        to_update.append(balance)
+    LeaveBalance.objects.bulk_update(to_update, ['used_days', 'pending_days'], batch_size=500)
+    
+    # Whatever is left had no balance row yet for that year
+    LeaveBalance.objects.bulk_create([
+        LeaveBalance(
+            user_id=user_id, leave_type_id=leave_type_id, year=year,
+            total_allocated=allowances[(user_id, leave_type_id, year)],
+            used_days=days
+        )
+        for (user_id, leave_type_id, year), days in deltas.items()
+    ], batch_size=500)
 
 class LeaveApplicationApprovalSerializer(serializers.ModelSerializer):
     """Serializer for HR to approve/reject leave applications"""
@@ -281,16 +359,48 @@ class LeaveApplicationApprovalSerializer(serializers.ModelSerializer):
         return attrs
     
     def update(self, instance, validated_data):
-        from django.utils import timezone
-        
         instance.status = validated_data['status']
         instance.approval_comments = validated_data.get('approval_comments', '')
         instance.approved_by = self.context['request'].user
         instance.approved_on = timezone.now()
         
-        # Store previous status for balance calculation
-        instance._previous_status = 'PENDING'
-        
         instance.save()
         send_leave_status_email(instance)
-        return instance
\ No newline at end of file
+        return instance
+    
+    @staticmethod
+    def bulk_approve(queryset, user, approval_comments=''):
+        """
+        Approve the pending applications in queryset with one UPDATE and batched
+        balance writes instead of a save() per row; returns the approved applications
+        """
+        approved_on = timezone.now()
+        with transaction.atomic():
+            applications = list(
+                queryset.select_for_update(of=('self',)).select_related(
+                    'employee', 'leave_type'
+                ).filter(status='PENDING')
+            )
+            if applications:
+                LeaveApplication.objects.filter(
+                    id__in=[app.id for app in applications]
+                ).update(
+                    status='APPROVED',
+                    approval_comments=approval_comments,
+                    approved_by=user,
+                    approved_on=approved_on
+                )
+                _apply_approvals_to_balances(applications)
+        
+        if applications:
+            # update() and the bulk balance writes send no signals
+            invalidate_leave_reports()
+        
+        for app in applications:
+            app.status = 'APPROVED'
+            app.approval_comments = approval_comments
+            app.approved_by = user
+            app.approved_on = approved_on
+            send_leave_status_email(app)
+        
+        return applications
\ No newline at end of file
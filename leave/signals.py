@@ -0,0 +1,56 @@
+import time
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import LeaveApplication, LeaveBalance, LeaveType
+
+LEAVE_TYPES_CACHE_KEY = 'leave-types-by-id'
+LEAVE_TYPES_CACHE_TIMEOUT = 3600
+LEAVE_REPORT_VERSION_CACHE_KEY = 'leave-report-version'
+
+
+def get_leave_types_by_id():
+    """Return every leave type keyed by id, cached since the table is small and rarely changes"""
+    leave_types = cache.get(LEAVE_TYPES_CACHE_KEY)
+    if leave_types is None:
+        leave_types = {leave_type.id: leave_type for leave_type in LeaveType.objects.all()}
+        cache.set(LEAVE_TYPES_CACHE_KEY, leave_types, LEAVE_TYPES_CACHE_TIMEOUT)
+    return leave_types
+
+
+def invalidate_leave_types():
+    """Drop the cached leave types so the next lookup reloads them"""
+    cache.delete(LEAVE_TYPES_CACHE_KEY)
+
+
+@receiver(post_save, sender=LeaveType)
+@receiver(post_delete, sender=LeaveType)
+def leave_type_changed(sender, **kwargs):
+    invalidate_leave_types()
+
+
+def leave_report_cache_version():
+    """Current version for leave report cache keys; bumping it retires every cached report"""
+    version = cache.get(LEAVE_REPORT_VERSION_CACHE_KEY)
+    if version is None:
+        version = time.time_ns()
+        cache.set(LEAVE_REPORT_VERSION_CACHE_KEY, version, None)
+    return version
+
+
+def invalidate_leave_reports():
+    """Start a new report cache version so the next report requests recompute"""
+    # A fresh timestamp rather than incr(), so an evicted counter can't
+    # restart at a version whose reports are still cached
+    cache.set(LEAVE_REPORT_VERSION_CACHE_KEY, time.time_ns(), None)
+
+
+# Applications and balances feed every cached leave report
+@receiver(post_save, sender=LeaveApplication)
+@receiver(post_delete, sender=LeaveApplication)
+@receiver(post_save, sender=LeaveBalance)
+@receiver(post_delete, sender=LeaveBalance)
+def leave_report_data_changed(sender, **kwargs):
+    invalidate_leave_reports()
@@ -1,3 +1,199 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from .models import LeaveApplication, LeaveApplicationComment, LeaveBalance, LeaveType
+
+User = get_user_model()
+
+
+class LeaveTestCase(TestCase):
+    """Shared users, leave type and a balance with days pending"""
+
+    def setUp(self):
+        cache.clear()
+        self.hr = User.objects.create_user('hr', 'hr@example.com', 'pass', role='HR')
+        self.employee = User.objects.create_user(
+            'employee', 'employee@example.com', 'pass',
+            role='EMPLOYEE', first_name='Ada', last_name='Lovelace'
+        )
+        self.leave_type = LeaveType.objects.create(name='Annual Leave', max_days_per_year=20)
+        self.start = date.today() + timedelta(days=30)
+        self.balance = LeaveBalance.objects.create(
+            user=self.employee, leave_type=self.leave_type, year=self.start.year,
+            total_allocated=20, pending_days=5
+        )
+        self.client = APIClient()
+
+    def create_application(self, days=2, offset=0, **kwargs):
+        start = self.start + timedelta(days=offset)
+        return LeaveApplication.objects.create(
+            employee=kwargs.pop('employee', self.employee),
+            leave_type=kwargs.pop('leave_type', self.leave_type),
+            start_date=start,
+            end_date=start + timedelta(days=days - 1),
+            total_days=days,
+            reason='Holiday',
+            **kwargs
+        )
+
+
+class LeaveBalanceAccountingTests(LeaveTestCase):
+
+    def test_single_approval_moves_pending_days_to_used(self):
+        application = self.create_application(days=2)
+        self.client.force_authenticate(self.hr)
+
+        response = self.client.post(
+            reverse('leave-application-approve', args=[application.pk]),
+            {'status': 'APPROVED'}, format='json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.balance.refresh_from_db()
+        self.assertEqual(self.balance.used_days, Decimal('2'))
+        self.assertEqual(self.balance.pending_days, Decimal('3'))
+
+    def test_approval_outside_the_serializer_also_releases_pending_days(self):
+        application = LeaveApplication.objects.get(pk=self.create_application(days=2).pk)
+
+        application.status = 'APPROVED'
+        application.save()
+
+        self.balance.refresh_from_db()
+        self.assertEqual(self.balance.used_days, Decimal('2'))
+        self.assertEqual(self.balance.pending_days, Decimal('3'))
+
+    def test_bulk_approval_updates_each_balance_once(self):
+        other = User.objects.create_user('other', 'other@example.com', 'pass', role='EMPLOYEE')
+        first = self.create_application(days=2)
+        second = self.create_application(days=1, offset=5)
+        third = self.create_application(days=3, employee=other)
+        self.client.force_authenticate(self.hr)
+
+        response = self.client.post(
+            reverse('bulk-approve-leaves'),
+            {'application_ids': [first.pk, second.pk, third.pk]}, format='json'
+        )
+
+        self.assertEqual(response.data['updated_count'], 3)
+        self.balance.refresh_from_db()
+        self.assertEqual(self.balance.used_days, Decimal('3'))
+        self.assertEqual(self.balance.pending_days, Decimal('2'))
+        # No balance existed for the other employee, so one is created
+        created = LeaveBalance.objects.get(user=other, leave_type=self.leave_type, year=self.start.year)
+        self.assertEqual(created.total_allocated, Decimal('20'))
+        self.assertEqual(created.used_days, Decimal('3'))
+        self.assertEqual(
+            set(LeaveApplication.objects.values_list('status', flat=True)), {'APPROVED'}
+        )
+
+    def test_resaving_an_approved_application_leaves_the_balance_alone(self):
+        application = self.create_application(days=2, status='APPROVED')
+        self.balance.refresh_from_db()
+        self.assertEqual(self.balance.used_days, Decimal('2'))
+
+        application.approval_comments = 'Enjoy'
+        application.save()
+        LeaveApplication.objects.get(pk=application.pk).save()
+
+        self.balance.refresh_from_db()
+        self.assertEqual(self.balance.used_days, Decimal('2'))
+
+    def test_resaving_with_status_deferred_leaves_the_balance_alone(self):
+        application = self.create_application(days=2, status='APPROVED')
+
+        deferred = LeaveApplication.objects.only('id', 'employee', 'total_days').get(pk=application.pk)
+        deferred.approval_comments = 'Enjoy'
+        deferred.save()
+
+        self.balance.refresh_from_db()
+        self.assertEqual(self.balance.used_days, Decimal('2'))
+
+
+class LeaveListQueryCountTests(LeaveTestCase):
+
+    def setUp(self):
+        super().setUp()
+        for offset in range(5):
+            self.create_application(days=1, offset=offset)
+
+    def test_application_list_query_count_is_constant(self):
+        # One COUNT for pagination and one joined SELECT for the page
+        for user in (self.hr, self.employee):
+            self.client.force_authenticate(user)
+            with self.assertNumQueries(2):
+                response = self.client.get(reverse('leave-application-list-create'))
+            self.assertEqual(response.status_code, 200)
+
+    def test_balance_list_query_count_is_constant(self):
+        other = User.objects.create_user('other', 'other@example.com', 'pass', role='EMPLOYEE')
+        LeaveBalance.objects.create(user=other, leave_type=self.leave_type, year=self.start.year)
+        self.client.force_authenticate(self.hr)
+
+        # COUNT, balances, then one prefetch each for users and leave types
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('leave-balance-list'), {'year': self.start.year})
+        self.assertEqual(response.data['count'], 2)
+
+    def test_my_balances_reuse_the_requesting_user(self):
+        self.client.force_authenticate(self.employee)
+
+        # COUNT and one SELECT joined to the leave type; no query for the user
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('my-leave-balance'), {'year': self.start.year})
+        self.assertEqual(response.data['results'][0]['user']['username'], 'employee')
+
+
+class LeaveCommentVisibilityTests(LeaveTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.application = self.create_application()
+        LeaveApplicationComment.objects.create(
+            leave_application=self.application, author=self.hr, comment='SECRET', is_internal=True
+        )
+        LeaveApplicationComment.objects.create(
+            leave_application=self.application, author=self.hr, comment='Noted'
+        )
+        self.url = reverse('leave-application-detail', args=[self.application.pk])
+
+    def comment_texts(self, response):
+        return [comment['comment'] for comment in response.data['comments']]
+
+    def test_employee_never_sees_internal_comments(self):
+        self.client.force_authenticate(self.employee)
+
+        self.assertEqual(self.comment_texts(self.client.get(self.url)), ['Noted'])
+        response = self.client.patch(self.url, {'reason': 'Family visit'}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.comment_texts(response), ['Noted'])
+
+    def test_hr_sees_internal_comments(self):
+        self.client.force_authenticate(self.hr)
+
+        response = self.client.patch(self.url, {'reason': 'Family visit'}, format='json')
+
+        self.assertEqual(sorted(self.comment_texts(response)), ['Noted', 'SECRET'])
+
+
+class LeaveReportCacheTests(LeaveTestCase):
+
+    def test_statistics_cache_is_retired_when_applications_change(self):
+        self.client.force_authenticate(self.hr)
+        url = reverse('leave-statistics')
+        self.assertEqual(self.client.get(url).data['summary']['total_applications'], 0)
+
+        application = self.create_application()
+        self.assertEqual(self.client.get(url).data['summary']['total_applications'], 1)
 
-# Create your tests here.
+        self.client.post(
+            reverse('bulk-approve-leaves'), {'application_ids': [application.pk]}, format='json'
+        )
+        self.assertEqual(self.client.get(url).data['summary']['approved_applications'], 1)
@@ -2,24 +2,28 @@ from rest_framework import generics, status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework.exceptions import ValidationError
 from django.db.models import Q, Count, Sum, Avg
+from django.db.models.functions import ExtractMonth
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.shortcuts import get_object_or_404
-from django.utils import timezone
 from datetime import date, timedelta, datetime
+from urllib.parse import urlencode
 
 from .models import (
     LeaveType, LeaveBalance, LeaveApplication, 
     LeaveApplicationAttachment, LeaveApplicationComment
 )
 from .serializers import (
-    LeaveTypeSerializer, LeaveBalanceSerializer, LeaveApplicationDetailSerializer,
-    LeaveApplicationListSerializer, LeaveApplicationCreateSerializer,
+    LeaveTypeSerializer, LeaveBalanceSerializer, LeaveBalanceListSerializer,
+    LeaveApplicationDetailSerializer, LeaveApplicationListSerializer, LeaveApplicationCreateSerializer,
     LeaveApplicationApprovalSerializer, LeaveApplicationAttachmentSerializer,
     LeaveApplicationCommentSerializer
 )
-from .email_utils import send_leave_status_email
+from .signals import leave_report_cache_version
 from accounts.views import IsHRPermission
+from attendance.models import AttendanceRecord
 
 User = get_user_model()
 
@@ -50,16 +54,13 @@ class LeaveApplicationListCreateAPIView(generics.ListCreateAPIView):
     def get_queryset(self):
         user = self.request.user
         
+        queryset = LeaveApplicationListSerializer.setup_eager_loading(LeaveApplication.objects.all())
         if user.is_hr:
             # HR can see all applications except their own
-            queryset = LeaveApplication.objects.select_related(
-                'employee', 'leave_type', 'approved_by'
-            ).exclude(employee=user)
+            queryset = queryset.exclude(employee=user)
         else:
             # Employees can only see their own applications
-            queryset = LeaveApplication.objects.select_related(
-                'leave_type', 'approved_by'
-            ).filter(employee=user)
+            queryset = queryset.filter(employee=user)
         
         # Filter parameters
         status_filter = self.request.query_params.get('status')
@@ -97,14 +98,11 @@ class LeaveApplicationDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
     
     def get_queryset(self):
         user = self.request.user
+        queryset = LeaveApplicationDetailSerializer.setup_eager_loading(LeaveApplication.objects.all(), user)
         if user.is_hr:
-            return LeaveApplication.objects.select_related(
-                'employee', 'leave_type', 'approved_by', 'replacement_employee'
-            ).prefetch_related('attachments', 'comments').all()
+            return queryset
         else:
-            return LeaveApplication.objects.select_related(
-                'leave_type', 'approved_by', 'replacement_employee'
-            ).prefetch_related('attachments', 'comments').filter(employee=user)
+            return queryset.filter(employee=user)
     
     def update(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -154,7 +152,9 @@ class LeaveApplicationApprovalAPIView(APIView):
     
     def post(self, request, pk):
         try:
-            leave_application = LeaveApplication.objects.get(pk=pk)
+            leave_application = LeaveApplicationDetailSerializer.setup_eager_loading(
+                LeaveApplication.objects.all(), request.user
+            ).get(pk=pk)
         except LeaveApplication.DoesNotExist:
             return Response(
                 {'error': 'Leave application not found.'}, 
@@ -185,27 +185,22 @@ class LeaveApplicationApprovalAPIView(APIView):
 
 class LeaveBalanceListAPIView(generics.ListAPIView):
     """List leave balances"""
-    serializer_class = LeaveBalanceSerializer
+    serializer_class = LeaveBalanceListSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
         user = self.request.user
         year = self.request.query_params.get('year', date.today().year)
+        queryset = LeaveBalanceListSerializer.setup_eager_loading(LeaveBalance.objects.all())
         
         if user.is_hr:
             employee_id = self.request.query_params.get('employee')
             if employee_id:
-                return LeaveBalance.objects.select_related(
-                    'user', 'leave_type'
-                ).filter(user_id=employee_id, year=year)
+                return queryset.filter(user_id=employee_id, year=year)
             else:
-                return LeaveBalance.objects.select_related(
-                    'user', 'leave_type'
-                ).filter(year=year)
+                return queryset.filter(year=year)
         else:
-            return LeaveBalance.objects.select_related(
-                'leave_type'
-            ).filter(user=user, year=year)
+            return queryset.filter(user=user, year=year)
 
 class MyLeaveBalanceAPIView(generics.ListAPIView):
     """Get current user's leave balances"""
@@ -214,9 +209,11 @@ class MyLeaveBalanceAPIView(generics.ListAPIView):
     
     def get_queryset(self):
         year = self.request.query_params.get('year', date.today().year)
-        return LeaveBalance.objects.select_related(
+        # The reverse manager attaches request.user to each balance, so the
+        # user isn't loaded again
+        return self.request.user.leave_balances.select_related(
             'leave_type'
-        ).filter(user=self.request.user, year=year)
+        ).filter(year=year)
 
 # Leave Application Attachments
 
@@ -233,7 +230,7 @@ class LeaveApplicationAttachmentListCreateAPIView(generics.ListCreateAPIView):
         if not self.request.user.is_hr and leave_app.employee != self.request.user:
             return LeaveApplicationAttachment.objects.none()
         
-        return leave_app.attachments.all()
+        return leave_app.attachments.select_related('uploaded_by')
     
     def perform_create(self, serializer):
         leave_app_id = self.kwargs['leave_app_id']
@@ -263,7 +260,7 @@ class LeaveApplicationCommentListCreateAPIView(generics.ListCreateAPIView):
         if not self.request.user.is_hr and leave_app.employee != self.request.user:
             return LeaveApplicationComment.objects.none()
         
-        comments = leave_app.comments.all()
+        comments = leave_app.comments.select_related('author')
         
         # Non-HR users cannot see internal comments
         if not self.request.user.is_hr:
@@ -286,29 +283,57 @@ class LeaveApplicationCommentListCreateAPIView(generics.ListCreateAPIView):
 
 # Statistics and Reports
 
+# HR reports are re-requested with the same parameters; serve repeats from cache.
+# Keys carry a version that leave.signals bumps whenever leave data changes
+REPORT_CACHE_TIMEOUT = 300
+
+
+def _report_cache_key(name, request):
+    """Cache key for a report view, built from its query parameters"""
+    params = urlencode(sorted(request.query_params.items()))
+    return f"leave-report:{leave_report_cache_version()}:{name}:{params}"
+
+
+def _parse_report_date(value, param):
+    """Parse a YYYY-MM-DD report parameter; malformed input is a 400, not a 500"""
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValidationError({param: 'Enter a valid date in YYYY-MM-DD format.'})
+
 @api_view(['GET'])
 @permission_classes([IsHRPermission])
 def leave_statistics(request):
     """Get comprehensive leave statistics"""
+    cache_key = _report_cache_key('statistics', request)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return Response(cached)
+    
     current_year = date.today().year
     
     # Overall statistics
-    total_applications = LeaveApplication.objects.count()
-    pending_applications = LeaveApplication.objects.filter(status='PENDING').count()
-    approved_applications = LeaveApplication.objects.filter(status='APPROVED').count()
-    rejected_applications = LeaveApplication.objects.filter(status='REJECTED').count()
+    overall = LeaveApplication.objects.aggregate(
+        total=Count('id'),
+        pending=Count('id', filter=Q(status='PENDING')),
+        approved=Count('id', filter=Q(status='APPROVED')),
+        rejected=Count('id', filter=Q(status='REJECTED'))
+    )
     
-    # Monthly breakdown for current year
-    monthly_stats = []
-    for month in range(1, 13):
-        month_applications = LeaveApplication.objects.filter(
-            start_date__year=current_year,
-            start_date__month=month
-        ).count()
-        monthly_stats.append({
-            'month': month,
-            'applications': month_applications
-        })
+    # Monthly breakdown for current year, counted in one grouped query
+    month_counts = dict(
+        LeaveApplication.objects.filter(
+            start_date__year=current_year
+        ).annotate(
+            month=ExtractMonth('start_date')
+        ).values('month').annotate(
+            applications=Count('id')
+        ).order_by().values_list('month', 'applications')
+    )
+    monthly_stats = [
+        {'month': month, 'applications': month_counts.get(month, 0)}
+        for month in range(1, 13)
+    ]
     
     # Leave type breakdown
     leave_type_stats = LeaveApplication.objects.values(
@@ -338,10 +363,10 @@ def leave_statistics(request):
     
     stats = {
         'summary': {
-            'total_applications': total_applications,
-            'pending_applications': pending_applications,
-            'approved_applications': approved_applications,
-            'rejected_applications': rejected_applications,
+            'total_applications': overall['total'],
+            'pending_applications': overall['pending'],
+            'approved_applications': overall['approved'],
+            'rejected_applications': overall['rejected'],
         },
         'monthly_breakdown': monthly_stats,
         'leave_type_breakdown': list(leave_type_stats),
@@ -349,6 +374,7 @@ def leave_statistics(request):
         'top_applicants': list(top_applicants),
     }
     
+    cache.set(cache_key, stats, REPORT_CACHE_TIMEOUT)
     return Response(stats)
 
 @api_view(['GET'])
@@ -359,33 +385,30 @@ def my_leave_summary(request):
     current_year = date.today().year
     
     # Applications summary
-    total_applications = user.leave_applications.count()
-    pending_applications = user.leave_applications.filter(status='PENDING').count()
-    approved_applications = user.leave_applications.filter(status='APPROVED').count()
+    application_counts = user.leave_applications.aggregate(
+        total=Count('id'),
+        pending=Count('id', filter=Q(status='PENDING')),
+        approved=Count('id', filter=Q(status='APPROVED'))
+    )
     
     # Leave balances
-    balances = LeaveBalance.objects.filter(user=user, year=current_year)
+    balances = LeaveBalance.objects.select_related('user', 'leave_type').filter(user=user, year=current_year)
     balance_data = LeaveBalanceSerializer(balances, many=True).data
     
     # Recent applications
-    recent_applications = user.leave_applications.select_related(
-        'leave_type'
+    recent_applications = LeaveApplicationListSerializer.setup_eager_loading(
+        user.leave_applications.all()
     )[:5]
     recent_data = LeaveApplicationListSerializer(recent_applications, many=True).data
     
     # Upcoming leaves
-    upcoming_leaves = user.leave_applications.filter(
-        status='APPROVED',
-        start_date__gte=date.today()
-    ).select_related('leave_type')[:3]
+    upcoming_leaves = LeaveApplicationListSerializer.setup_eager_loading(
+        user.leave_applications.filter(status='APPROVED', start_date__gte=date.today())
+    )[:3]
     upcoming_data = LeaveApplicationListSerializer(upcoming_leaves, many=True).data
     
     summary = {
-        'applications_summary': {
-            'total': total_applications,
-            'pending': pending_applications,
-            'approved': approved_applications,
-        },
+        'applications_summary': application_counts,
         'leave_balances': balance_data,
         'recent_applications': recent_data,
         'upcoming_leaves': upcoming_data,
@@ -406,21 +429,13 @@ def bulk_approve_leaves(request):
             status=status.HTTP_400_BAD_REQUEST
         )
     
-    applications = LeaveApplication.objects.filter(
-        id__in=application_ids, 
-        status='PENDING'
+    applications = LeaveApplicationApprovalSerializer.bulk_approve(
+        LeaveApplication.objects.filter(id__in=application_ids),
+        request.user,
+        approval_comments
     )
     
-    updated_count = 0
-    for app in applications:
-        app.status = 'APPROVED'
-        app.approval_comments = approval_comments
-        app.approved_by = request.user
-        app.approved_on = timezone.now()
-        app.save()
-        send_leave_status_email(app)
-        updated_count += 1
-    
+    updated_count = len(applications)
     return Response({
         'message': f'Successfully approved {updated_count} leave applications',
         'updated_count': updated_count
@@ -458,46 +473,63 @@ def employee_leave_report(request):
         if not end_date:
             end_date = date.today()
         else:
-            end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
+            end_date = _parse_report_date(end_date, 'end_date')
         
         if not start_date:
             start_date = date(end_date.year, 1, 1)  # Beginning of current year
         else:
-            start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
+            start_date = _parse_report_date(start_date, 'start_date')
     
     # Get leave applications
     applications = LeaveApplication.objects.filter(
         employee=employee,
         start_date__gte=start_date,
         end_date__lte=end_date
-    ).select_related('leave_type', 'approved_by')
+    )
     
     # Statistics by status
-    status_stats = {
-        'pending': applications.filter(status='PENDING').count(),
-        'approved': applications.filter(status='APPROVED').count(),
-        'rejected': applications.filter(status='REJECTED').count(),
-        'cancelled': applications.filter(status='CANCELLED').count(),
-        'total': applications.count(),
+    status_stats = applications.aggregate(
+        pending=Count('id', filter=Q(status='PENDING')),
+        approved=Count('id', filter=Q(status='APPROVED')),
+        rejected=Count('id', filter=Q(status='REJECTED')),
+        cancelled=Count('id', filter=Q(status='CANCELLED')),
+        total=Count('id'),
+        approved_days=Sum('total_days', filter=Q(status='APPROVED'))
+    )
+    approved_days = status_stats.pop('approved_days') or 0
+    
+    # Statistics by leave type, summed in the database per leave type
+    type_totals = {
+        row['leave_type_id']: row
+        for row in applications.values('leave_type_id').annotate(
+            total=Count('id'),
+            pending=Count('id', filter=Q(status='PENDING')),
+            days_used=Sum('total_days', filter=Q(status='APPROVED')),
+        ).order_by()
+    }
+    balance_totals = {
+        row['leave_type_id']: row
+        for row in LeaveBalance.objects.filter(
+            user=employee,
+            year__gte=start_date.year,
+            year__lte=end_date.year
+        ).values('leave_type_id').annotate(
+            allocated=Sum('total_allocated'),
+            used=Sum('used_days'),
+            pending=Sum('pending_days'),
+        ).order_by()
     }
     
-    # Statistics by leave type
     leave_type_stats = []
-    leave_types = LeaveType.objects.filter(is_active=True)
-    
-    for lt in leave_types:
-        type_apps = applications.filter(leave_type=lt)
-        approved_apps = type_apps.filter(status='APPROVED')
-        
-        # Calculate total days used
-        total_days_used = sum([app.total_days for app in approved_apps])
+    for lt in LeaveType.objects.filter(is_active=True).only('id', 'name', 'max_days_per_year'):
+        type_apps = type_totals.get(lt.id, {})
+        total_days_used = type_apps.get('days_used') or 0
         
-        # Get balance
-        try:
-            balance = LeaveBalance.objects.get(employee=employee, leave_type=lt)
-            remaining = balance.remaining_days
-            total_allocated = balance.total_days
-        except LeaveBalance.DoesNotExist:
+        balance = balance_totals.get(lt.id)
+        if balance:
+            total_allocated = balance['allocated']
+            remaining = total_allocated - balance['used'] - balance['pending']
+        else:
             remaining = lt.max_days_per_year or 0
             total_allocated = lt.max_days_per_year or 0
         
@@ -506,26 +538,31 @@ def employee_leave_report(request):
             'total_allocated': total_allocated,
             'days_used': total_days_used,
             'days_remaining': remaining,
-            'applications_count': type_apps.count(),
-            'pending_count': type_apps.filter(status='PENDING').count(),
-            'utilization_rate': round((total_days_used / total_allocated * 100), 2) if total_allocated > 0 else 0,
+            'applications_count': type_apps.get('total', 0),
+            'pending_count': type_apps.get('pending', 0),
+            'utilization_rate': round(float(total_days_used / total_allocated * 100), 2) if total_allocated > 0 else 0,
         })
     
     # Monthly distribution
-    from datetime import datetime
+    month_totals = {
+        row['month']: row
+        for row in applications.filter(status='APPROVED').annotate(
+            month=ExtractMonth('start_date')
+        ).values('month').annotate(
+            count=Count('id'),
+            days=Sum('total_days'),
+        ).order_by()
+    }
     monthly_stats = {}
     for month in range(1, 13):
-        month_apps = applications.filter(
-            start_date__month=month,
-            status='APPROVED'
-        )
+        month_row = month_totals.get(month, {})
         monthly_stats[datetime(2000, month, 1).strftime('%B')] = {
-            'count': month_apps.count(),
-            'days': sum([app.total_days for app in month_apps])
+            'count': month_row.get('count', 0),
+            'days': month_row.get('days') or 0
         }
     
     # Recent applications
-    recent_apps = applications.order_by('-created_at')[:10]
+    recent_apps = LeaveApplicationListSerializer.setup_eager_loading(applications).order_by('-applied_on')[:10]
     
     report = {
         'employee': {
@@ -544,8 +581,8 @@ def employee_leave_report(request):
             'approved_applications': status_stats['approved'],
             'pending_applications': status_stats['pending'],
             'rejected_applications': status_stats['rejected'],
-            'total_days_taken': sum([app.total_days for app in applications.filter(status='APPROVED')]),
-            'average_leave_duration': round(sum([app.total_days for app in applications.filter(status='APPROVED')]) / status_stats['approved'], 2) if status_stats['approved'] > 0 else 0,
+            'total_days_taken': approved_days,
+            'average_leave_duration': round(approved_days / status_stats['approved'], 2) if status_stats['approved'] > 0 else 0,
         },
         'status_breakdown': status_stats,
         'leave_type_breakdown': leave_type_stats,
@@ -563,6 +600,11 @@ def employee_leave_report(request):
 @permission_classes([IsHRPermission])
 def team_leave_report(request):
     """Generate leave report for all employees (HR only)"""
+    cache_key = _report_cache_key('team', request)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return Response(cached)
+    
     start_date = request.query_params.get('start_date')
     end_date = request.query_params.get('end_date')
     department = request.query_params.get('department')
@@ -577,44 +619,58 @@ def team_leave_report(request):
         if not end_date:
             end_date = date.today()
         else:
-            end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
+            end_date = _parse_report_date(end_date, 'end_date')
         
         if not start_date:
             start_date = date(end_date.year, 1, 1)
         else:
-            start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
+            start_date = _parse_report_date(start_date, 'start_date')
     
     # Get employees
     employees = User.objects.filter(role='EMPLOYEE', is_active=True)
     if department:
-        employees = employees.filter(employee_profile__department__name=department)
+        employees = employees.filter(department=department)
     
-    # Generate report for each employee
-    team_data = []
-    for emp in employees:
-        applications = LeaveApplication.objects.filter(
-            employee=emp,
+    # Per-employee application and balance totals, one grouped query each
+    application_totals = {
+        row['employee_id']: row
+        for row in LeaveApplication.objects.filter(
+            employee__in=employees,
             start_date__gte=start_date,
             end_date__lte=end_date
-        )
-        
-        approved_apps = applications.filter(status='APPROVED')
-        pending_apps = applications.filter(status='PENDING')
-        total_days_taken = sum([app.total_days for app in approved_apps])
-        
-        # Get total allocated days
-        balances = LeaveBalance.objects.filter(employee=emp)
-        total_allocated = sum([b.total_days for b in balances])
-        total_remaining = sum([b.remaining_days for b in balances])
+        ).values('employee_id').annotate(
+            total=Count('id'),
+            approved=Count('id', filter=Q(status='APPROVED')),
+            pending=Count('id', filter=Q(status='PENDING')),
+            days_taken=Sum('total_days', filter=Q(status='APPROVED')),
+        ).order_by()
+    }
+    balance_totals = {
+        row['user_id']: row
+        for row in LeaveBalance.objects.filter(user__in=employees).values('user_id').annotate(
+            allocated=Sum('total_allocated'),
+            used=Sum('used_days'),
+            pending=Sum('pending_days'),
+        ).order_by()
+    }
+    
+    # Generate report for each employee
+    team_data = []
+    for emp in employees.only('id', 'first_name', 'last_name', 'email', 'department'):
+        apps = application_totals.get(emp.id, {})
+        balance = balance_totals.get(emp.id, {})
+        total_days_taken = apps.get('days_taken') or 0
+        total_allocated = balance.get('allocated') or 0
+        total_remaining = total_allocated - (balance.get('used') or 0) - (balance.get('pending') or 0)
         
         team_data.append({
             'employee_id': emp.id,
             'employee_name': f"{emp.first_name} {emp.last_name}",
             'email': emp.email,
-            'department': emp.employee_profile.department.name if hasattr(emp, 'employee_profile') and emp.employee_profile.department else 'Unassigned',
-            'total_applications': applications.count(),
-            'approved_applications': approved_apps.count(),
-            'pending_applications': pending_apps.count(),
+            'department': emp.department or 'Unassigned',
+            'total_applications': apps.get('total', 0),
+            'approved_applications': apps.get('approved', 0),
+            'pending_applications': apps.get('pending', 0),
             'days_taken': total_days_taken,
             'days_allocated': total_allocated,
             'days_remaining': total_remaining,
@@ -654,12 +710,18 @@ def team_leave_report(request):
         'employee_details': team_data,
     }
     
+    cache.set(cache_key, report, REPORT_CACHE_TIMEOUT)
     return Response(report)
 
 @api_view(['GET'])
 @permission_classes([IsHRPermission])
 def leave_analytics(request):
     """Generate leave analytics and insights (HR only)"""
+    cache_key = _report_cache_key('analytics', request)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return Response(cached)
+    
     start_date = request.query_params.get('start_date')
     end_date = request.query_params.get('end_date')
     
@@ -667,83 +729,112 @@ def leave_analytics(request):
     if not end_date:
         end_date = date.today()
     else:
-        end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
+        end_date = _parse_report_date(end_date, 'end_date')
     
     if not start_date:
         start_date = date(end_date.year, 1, 1)
     else:
-        start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
+        start_date = _parse_report_date(start_date, 'start_date')
     
     applications = LeaveApplication.objects.filter(
         start_date__gte=start_date,
         end_date__lte=end_date
     )
     
+    # Overview counts in a single pass
+    overview = applications.aggregate(
+        total=Count('id'),
+        approved=Count('id', filter=Q(status='APPROVED')),
+        pending=Count('id', filter=Q(status='PENDING')),
+        rejected=Count('id', filter=Q(status='REJECTED'))
+    )
+    
     # Status distribution
     status_distribution = applications.values('status').annotate(
         count=Count('id')
     ).order_by('-count')
     
     # Leave type popularity
-    leave_type_stats = applications.values('leave_type__name').annotate(
-        count=Count('id'),
-        total_days=Sum('total_days'),
-        avg_duration=Avg('total_days')
-    ).order_by('-count')
+    leave_type_stats = [
+        {
+            'leave_type__name': row['leave_type__name'],
+            'count': row['count'],
+            'total_days': row['days_total'],
+            'avg_duration': row['avg_duration'],
+        }
+        # days_total, not total_days: that alias would hide the field from Avg
+        for row in applications.values('leave_type__name').annotate(
+            count=Count('id'),
+            days_total=Sum('total_days'),
+            avg_duration=Avg('total_days')
+        ).order_by('-count')
+    ]
+    
+    # Monthly trends - one GROUP BY, then fill in months without applications
+    monthly_rows = {
+        row['month']: row for row in applications.annotate(
+            month=ExtractMonth('start_date')
+        ).values('month').annotate(
+            applications=Count('id'),
+            approved=Count('id', filter=Q(status='APPROVED')),
+            days_taken=Sum('total_days', filter=Q(status='APPROVED'))
+        ).order_by()
+    }
     
-    # Monthly trends
     monthly_trends = {}
     for month in range(1, 13):
-        month_apps = applications.filter(start_date__month=month)
+        row = monthly_rows.get(month, {})
         monthly_trends[datetime(2000, month, 1).strftime('%B')] = {
-            'applications': month_apps.count(),
-            'approved': month_apps.filter(status='APPROVED').count(),
-            'days_taken': sum([app.total_days for app in month_apps.filter(status='APPROVED')])
+            'applications': row.get('applications', 0),
+            'approved': row.get('approved', 0),
+            'days_taken': row.get('days_taken') or 0
         }
     
-    # Department-wise stats
-    from employees.models import Department
-    departments = Department.objects.all()
+    # Department-wise stats in a single grouped query
+    dept_rows = applications.values('employee__department').annotate(
+        total=Count('id'),
+        approved=Count('id', filter=Q(status='APPROVED')),
+        days_taken=Sum('total_days', filter=Q(status='APPROVED')),
+    ).order_by('employee__department')
     dept_stats = []
     
-    for dept in departments:
-        dept_apps = applications.filter(employee__employee_profile__department=dept)
-        dept_approved = dept_apps.filter(status='APPROVED')
-        
+    for row in dept_rows:
         dept_stats.append({
-            'department': dept.name,
-            'total_applications': dept_apps.count(),
-            'approved_applications': dept_approved.count(),
-            'total_days_taken': sum([app.total_days for app in dept_approved]),
-            'approval_rate': round((dept_approved.count() / dept_apps.count() * 100), 2) if dept_apps.count() > 0 else 0,
+            'department': row['employee__department'] or 'Unassigned',
+            'total_applications': row['total'],
+            'approved_applications': row['approved'],
+            'total_days_taken': row['days_taken'] or 0,
+            'approval_rate': round((row['approved'] / row['total'] * 100), 2) if row['total'] > 0 else 0,
         })
     
     # Approval time analysis
-    approved_apps = applications.filter(status='APPROVED', approved_on__isnull=False)
-    approval_times = []
-    for app in approved_apps:
-        if app.approved_on and app.created_at:
-            delta = (app.approved_on - app.created_at).days
-            approval_times.append(delta)
+    approval_times = [
+        (approved_on - applied_on).days
+        for approved_on, applied_on in applications.filter(
+            status='APPROVED', approved_on__isnull=False
+        ).values_list('approved_on', 'applied_on')
+    ]
     
     avg_approval_time = round(sum(approval_times) / len(approval_times), 2) if approval_times else 0
     
-    # Most active leave takers
-    top_leave_takers = User.objects.filter(
-        role='EMPLOYEE',
-        leave_applications__start_date__gte=start_date,
-        leave_applications__end_date__lte=end_date,
-        leave_applications__status='APPROVED'
-    ).annotate(
-        leave_count=Count('leave_applications'),
-        total_days=Sum('leave_applications__total_days')
-    ).order_by('-total_days')[:10]
+    # Most active leave takers - group on the integer FK, then resolve names in one lookup
+    top_leave_takers = list(applications.filter(
+        status='APPROVED',
+        employee__role='EMPLOYEE'
+    ).values('employee_id').annotate(
+        leave_count=Count('id'),
+        total_days=Sum('total_days')
+    ).order_by('-total_days')[:10])
+    
+    takers = User.objects.only('first_name', 'last_name').in_bulk(
+        [row['employee_id'] for row in top_leave_takers]
+    )
     
     top_leave_takers_data = [{
-        'employee_name': f"{emp.first_name} {emp.last_name}",
-        'leave_applications': emp.leave_count,
-        'total_days_taken': emp.total_days,
-    } for emp in top_leave_takers]
+        'employee_name': f"{takers[row['employee_id']].first_name} {takers[row['employee_id']].last_name}",
+        'leave_applications': row['leave_count'],
+        'total_days_taken': row['total_days'],
+    } for row in top_leave_takers]
     
     analytics = {
         'period': {
@@ -751,19 +842,20 @@ def leave_analytics(request):
             'end_date': end_date,
         },
         'overview': {
-            'total_applications': applications.count(),
-            'approved_applications': applications.filter(status='APPROVED').count(),
-            'pending_applications': applications.filter(status='PENDING').count(),
-            'rejection_rate': round((applications.filter(status='REJECTED').count() / applications.count() * 100), 2) if applications.count() > 0 else 0,
+            'total_applications': overview['total'],
+            'approved_applications': overview['approved'],
+            'pending_applications': overview['pending'],
+            'rejection_rate': round((overview['rejected'] / overview['total'] * 100), 2) if overview['total'] > 0 else 0,
             'average_approval_time_days': avg_approval_time,
         },
         'status_distribution': list(status_distribution),
-        'leave_type_analysis': list(leave_type_stats),
+        'leave_type_analysis': leave_type_stats,
         'monthly_trends': monthly_trends,
         'department_analysis': dept_stats,
         'top_leave_takers': top_leave_takers_data,
     }
     
+    cache.set(cache_key, analytics, REPORT_CACHE_TIMEOUT)
     return Response(analytics)
 
 @api_view(['GET'])
@@ -784,38 +876,42 @@ def combined_performance_report(request):
     start_date = date(year, 1, 1)
     end_date = date(year, 12, 31)
     
-    # Attendance metrics
-    attendance_records = AttendanceRecord.objects.filter(
+    # Attendance metrics in one scan of the employee's records
+    hours_stats = AttendanceRecord.objects.filter(
         employee=employee,
         date__gte=start_date,
         date__lte=end_date
-    )
-    
-    total_days = (end_date - start_date).days + 1
-    present_days = attendance_records.filter(status__in=['PRESENT', 'HALF_DAY']).count()
-    late_days = attendance_records.filter(status='LATE').count()
-    absent_days = attendance_records.filter(status='ABSENT').count()
-    
-    hours_stats = attendance_records.aggregate(
+    ).aggregate(
+        present_days=Count('id', filter=Q(status__in=['PRESENT', 'HALF_DAY'])),
+        late_days=Count('id', filter=Q(status='LATE')),
+        absent_days=Count('id', filter=Q(status='ABSENT')),
         total_hours=Sum('actual_hours'),
         total_overtime=Sum('overtime_hours'),
         avg_hours=Avg('actual_hours')
     )
     
+    total_days = (end_date - start_date).days + 1
+    present_days = hours_stats['present_days']
+    late_days = hours_stats['late_days']
+    absent_days = hours_stats['absent_days']
+    
     # Leave metrics
-    leave_applications = LeaveApplication.objects.filter(
+    leave_stats = LeaveApplication.objects.filter(
         employee=employee,
         start_date__gte=start_date,
         end_date__lte=end_date
+    ).aggregate(
+        total=Count('id'),
+        approved=Count('id', filter=Q(status='APPROVED')),
+        rejected=Count('id', filter=Q(status='REJECTED')),
+        approved_days=Sum('total_days', filter=Q(status='APPROVED'))
     )
-    
-    approved_leaves = leave_applications.filter(status='APPROVED')
-    total_leave_days = sum([app.total_days for app in approved_leaves])
+    total_leave_days = leave_stats['approved_days'] or 0
     
     # Calculate performance scores
     attendance_score = round((present_days / total_days * 100), 2) if total_days > 0 else 0
     punctuality_score = round(((present_days - late_days) / present_days * 100), 2) if present_days > 0 else 0
-    leave_planning_score = round((approved_leaves.count() / leave_applications.count() * 100), 2) if leave_applications.count() > 0 else 100
+    leave_planning_score = round((leave_stats['approved'] / leave_stats['total'] * 100), 2) if leave_stats['total'] > 0 else 100
     
     # Overall performance score (weighted average)
     overall_score = round(
@@ -843,7 +939,7 @@ def combined_performance_report(request):
             'id': employee.id,
             'name': f"{employee.first_name} {employee.last_name}",
             'email': employee.email,
-            'department': employee.employee_profile.department.name if hasattr(employee, 'employee_profile') and employee.employee_profile.department else 'Unassigned',
+            'department': employee.department or 'Unassigned',
         },
         'period': {
             'year': year,
@@ -862,9 +958,9 @@ def combined_performance_report(request):
             'average_daily_hours': round(hours_stats['avg_hours'] or 0, 2),
         },
         'leave_metrics': {
-            'total_leave_applications': leave_applications.count(),
-            'approved_leaves': approved_leaves.count(),
-            'rejected_leaves': leave_applications.filter(status='REJECTED').count(),
+            'total_leave_applications': leave_stats['total'],
+            'approved_leaves': leave_stats['approved'],
+            'rejected_leaves': leave_stats['rejected'],
             'total_leave_days_taken': total_leave_days,
             'leave_planning_score': leave_planning_score,
         },
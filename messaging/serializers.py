@@ -32,10 +32,14 @@ class MessageSerializer(serializers.ModelSerializer):
         read_only_fields = ['sender', 'is_read', 'created_at', 'read_at']
 
     def get_replies_count(self, obj):
+        if hasattr(obj, 'replies_total'):
+            return obj.replies_total
         return obj.replies.count()
     
     def get_unread_replies_count(self, obj):
         """Count unread replies where current user is the recipient"""
+        if hasattr(obj, 'unread_replies_total'):
+            return obj.unread_replies_total
         request = self.context.get('request')
         if not request or not request.user:
             return 0
@@ -2,7 +2,7 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Q
+from django.db.models import Q, Count
 from .models import Message, Announcement
 from .serializers import MessageSerializer, MessageThreadSerializer, AnnouncementSerializer
 from accounts.models import CustomUser
@@ -15,9 +15,19 @@ class MessageViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
-        return Message.objects.filter(
+        queryset = Message.objects.filter(
             Q(sender=user) | Q(recipient=user)
         ).select_related('sender', 'recipient', 'parent_message')
+        
+        # Listings render reply counts for every row; count them in the same query
+        if self.action in ('list', 'inbox', 'sent'):
+            queryset = queryset.annotate(
+                replies_total=Count('replies'),
+                unread_replies_total=Count(
+                    'replies', filter=Q(replies__recipient=user, replies__is_read=False)
+                )
+            ).order_by('-created_at')  # Meta.ordering is not applied to grouped queries
+        return queryset
 
     def get_serializer_class(self):
         if self.action == 'retrieve':